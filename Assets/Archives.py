@@ -0,0 +1,154 @@
+"""Read-only access to ontology corpora shipped as zip, tar(.gz/.bz2/.xz) or rar archives, without extracting them.
+
+A member is addressed by a virtual path: the archive path joined with the member's path inside it, e.g.
+Ontologies.rar/SEAS/seas.ttl. A single folder wrapping the whole archive (Ontologies/ in Ontologies.rar) is left out,
+so the paths relative to the archive are the ones relative to the extracted folder.
+"""
+import io, os, shutil, subprocess, tarfile, time, zipfile
+from collections import namedtuple
+
+TAR_EXTENSIONS = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+ARCHIVE_EXTENSIONS = (".zip", ".rar") + TAR_EXTENSIONS
+
+ArchiveEntry = namedtuple("ArchiveEntry", ["name", "path"])
+# Open archives per (process, path): handles share a file offset, so a worker never reuses its parent's
+_OPEN = {}
+
+def is_archive(path):
+    return str(path).lower().endswith(ARCHIVE_EXTENSIONS) and os.path.isfile(path)
+
+class Archive:
+    """Regular files of an archive by relative "/"-separated path, in archive order, each readable as a binary stream."""
+    def __init__(self, path):
+        self.path = path
+        st = os.stat(path)
+        self.stamp = (st.st_size, st.st_mtime_ns)
+        entries = [(name.lstrip("/").removeprefix("./"), name, size, mtime) for name, size, mtime in self._list()]
+        folders = {rel.rsplit("/", 1)[0] for rel, *_ in entries if "/" in rel}
+        entries = [entry for entry in entries if entry[0] and entry[0] not in folders]
+        tops = {rel.split("/")[0] for rel, *_ in entries}
+        wrapper = tops.pop() + "/" if len(tops) == 1 and all("/" in rel for rel, *_ in entries) else ""
+        self.members = {rel.removeprefix(wrapper): (name, size, mtime) for rel, name, size, mtime in entries}
+
+    def _list(self):
+        """(name, size, mtime_ns) of every member."""
+        raise NotImplementedError
+
+    def _open(self, name):
+        raise NotImplementedError
+
+    def open(self, rel):
+        if rel not in self.members:
+            raise FileNotFoundError(f"No member {rel} in {self.path}")
+        return self._open(self.members[rel][0])
+
+    def stat(self, rel):
+        if rel not in self.members:
+            raise FileNotFoundError(f"No member {rel} in {self.path}")
+        return self.members[rel][1:]
+
+class ZipArchive(Archive):
+    """Members are read independently of each other, so any number of workers read in parallel."""
+    def _list(self):
+        self.zip = zipfile.ZipFile(self.path)
+        return [(info.filename, info.file_size, int(time.mktime(info.date_time + (0, 0, -1)) * 10**9))
+                for info in self.zip.infolist() if not info.is_dir()]
+
+    def _open(self, name):
+        return self.zip.open(name)
+
+class TarArchive(Archive):
+    """Plain tars are read at random; compressed ones are one stream, which each worker reads forward as its members come in order."""
+    def _list(self):
+        self.tar = tarfile.open(self.path)
+        self.infos = {info.name: info for info in self.tar.getmembers() if info.isfile()}
+        return [(info.name, info.size, int(info.mtime) * 10**9) for info in self.infos.values()]
+
+    def _open(self, name):
+        return self.tar.extractfile(self.infos[name])
+
+class RarArchive(Archive):
+    """Read through a local unrar, or bsdtar (libarchive), one tool process per member.
+
+    The tools do not report exact member times, so members take the size and mtime of the archive itself:
+    an unchanged archive is trusted without reading it, a changed one has every member hashed.
+    """
+    def _list(self):
+        self.unrar = shutil.which("unrar")
+        self.tool = self.unrar or shutil.which("bsdtar")
+        if self.tool is None:
+            raise ValueError(f"Reading {self.path} needs unrar or bsdtar on the PATH")
+        command = [self.tool, "lb", "-inul", self.path] if self.unrar else [self.tool, "-tf", self.path]
+        names = subprocess.run(command, capture_output=True, check=True).stdout.decode("utf-8", errors="replace").splitlines()
+        return [(name, *self.stamp) for name in names if name and not name.endswith("/")]
+
+    def _open(self, name):
+        # A file is opened several times in a row (format sniffing, hashing, parsing): keep the last one read
+        if getattr(self, "last", (None,))[0] != name:
+            command = [self.tool, "p", "-inul", "--", self.path, name] if self.unrar else [self.tool, "-xOf", self.path, name]
+            self.last = (name, subprocess.run(command, capture_output=True, check=True).stdout)
+        return io.BytesIO(self.last[1])
+
+def open_archive(path):
+    """Archive at path, opened once per process and reopened when the file changes."""
+    key = (os.getpid(), os.path.abspath(path))
+    archive = _OPEN.get(key)
+    st = os.stat(path)
+    if archive is None or archive.stamp != (st.st_size, st.st_mtime_ns):
+        lower = path.lower()
+        cls = ZipArchive if lower.endswith(".zip") else RarArchive if lower.endswith(".rar") else TarArchive
+        archive = _OPEN[key] = cls(path)
+    return archive
+
+def split_member(path):
+    """(archive path, member path) of a virtual path, or None when path does not lead into an archive."""
+    parent = os.path.dirname(path)
+    while parent and parent != os.path.dirname(parent) and not os.path.isdir(parent):
+        if is_archive(parent):
+            return parent, os.path.relpath(path, parent).replace(os.sep, "/")
+        parent = os.path.dirname(parent)
+    return None
+
+def archive_files(path):
+    """Virtual paths of the files under an archive or a folder inside one, or None for anything else."""
+    if is_archive(path):
+        archive, prefix = path, ""
+    else:
+        member = split_member(path)
+        if member is None:
+            return None
+        archive, prefix = member[0], member[1] + "/"
+    return [os.path.join(archive, *rel.split("/")) for rel in open_archive(archive).members if rel.startswith(prefix)]
+
+def archive_entries(path):
+    """(ArchiveEntry, is_dir) for each top-level file and folder of an archive, in archive order."""
+    entries = {}
+    for rel in open_archive(path).members:
+        name = rel.split("/")[0]
+        entries.setdefault(name, (ArchiveEntry(name, os.path.join(path, name)), "/" in rel))
+    return list(entries.values())
+
+def open_source(path):
+    """Binary stream of a file or an archive member."""
+    if os.path.isfile(path):
+        return open(path, "rb")
+    member = split_member(path)
+    if member is None:
+        raise FileNotFoundError(path)
+    return open_archive(member[0]).open(member[1])
+
+def source_stat(path):
+    """(size, mtime_ns) of a file or an archive member."""
+    if os.path.isfile(path):
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+    member = split_member(path)
+    if member is None:
+        raise FileNotFoundError(path)
+    return open_archive(member[0]).stat(member[1])
+
+def source_exists(path):
+    if os.path.isfile(path):
+        return True
+    member = split_member(path)
+    return member is not None and member[1] in open_archive(member[0]).members
@@ -0,0 +1,116 @@
+import hashlib, os, pickle, rdflib
+from rdflib import Graph
+from Assets.Archives import open_source
+from Assets.Parsing import parse_file
+from Assets.Terms import TermTable, TripleArrays
+
+CACHE_FORMAT = 2
+PARSER_VERSION = f"rdflib-{rdflib.__version__}/cache-{CACHE_FORMAT}"
+
+def file_hash(file_path, chunk_size: int = 1 << 20):
+    h = hashlib.sha256()
+    with open_source(file_path) as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+class ParseCache:
+    """On-disk cache of parsed triples keyed on file content hash and parser version, with an LRU size cap.
+
+    Entries store an interned term table plus an int32 array of triples, which loads several times faster than
+    re-parsing and can be indexed without materializing a Graph (see load_arrays).
+    """
+    def __init__(self, directory: str = ".cache/graphs", max_bytes: int = 1 << 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def clone(self):
+        """Same cache directory with fresh counters, for use inside a worker task."""
+        return ParseCache(self.directory, self.max_bytes)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def record(self, stats: dict):
+        self.hits += stats["hits"]
+        self.misses += stats["misses"]
+
+    def key(self, file_path):
+        ext = os.path.splitext(file_path)[1].lower()
+        return hashlib.sha256(f"{file_hash(file_path)}|{ext}|{PARSER_VERSION}".encode()).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def _read(self, path):
+        """Cached arrays at path, or None on a miss. An entry that fails to load in any way is deleted and counts as a miss."""
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                terms, rows = pickle.load(f)
+            if rows.ndim != 2 or rows.shape[1] != 3 or (rows.size and (rows.min() < 0 or rows.max() >= len(terms))):
+                raise ValueError("triple rows do not match the term table")
+            arrays = TripleArrays(TermTable(terms), rows)
+        except Exception as e:
+            print(f"Warning: discarding unreadable cache entry {path}: {type(e).__name__}: {e}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        os.utime(path)
+        return arrays
+
+    def load_arrays(self, file_path):
+        """Term-id arrays of file_path, parsing only on a cache miss."""
+        path = self.entry_path(self.key(file_path))
+        arrays = self._read(path)
+        if arrays is not None:
+            self.hits += 1
+            return arrays
+        self.misses += 1
+        return self.store(path, parse_file(Graph(), file_path))
+
+    def parse_into(self, g: Graph, file_path):
+        """Adds the triples of file_path to g, parsing only on a cache miss."""
+        path = self.entry_path(self.key(file_path))
+        arrays = self._read(path)
+        if arrays is not None:
+            self.hits += 1
+            g.addN((s, p, o, g) for s, p, o in arrays.triples())
+            return g
+        self.misses += 1
+        parsed = parse_file(g if len(g) == 0 else Graph(), file_path)
+        self.store(path, parsed)
+        if parsed is not g:
+            g += parsed
+        return g
+
+    def store(self, path, g: Graph):
+        arrays = TripleArrays.from_graph(g)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((arrays.table.terms, arrays.rows), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict()
+        return arrays
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".pickle"):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
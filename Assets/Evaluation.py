@@ -1,84 +1,472 @@
-import pandas as pd
-import os
-from rdflib import Graph, RDF, RDFS, OWL
-ONTO_EXTENSIONS = {'.ttl', '.rdf', '.owl'}
-from Assets.Metrics import Metrics
-from Assets.Utils import load_graph
-
-def find_ontology_files(directory):
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if any(file.endswith(ext) for ext in ONTO_EXTENSIONS):
-                yield os.path.join(root, file)
-
-def analyze_directory_as_one_ontology(directory_path):
+import json, os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from rdflib import Graph
+from Assets.Archives import archive_entries, is_archive
+from Assets.Cache import ParseCache
+from Assets.Imports import ImportResolver
+from Assets.Index import TripleIndex
+from Assets.Indicators import needs_axioms
+from Assets.Isolation import Limits, hit_limit, run_isolated
+from Assets.Manifest import Manifest
+from Assets.Metrics import Metrics, METRICS_VERSION, CLASSES_SUFFIX
+from Assets.Parsing import chunked, parse_file
+from Assets.Profiling import NULL_RECORDER, PROFILE_RECORDS, Profiler
+from Assets.Results import ResultJournal, read_results, write_results
+from Assets.Utils import ONTO_EXTENSIONS, find_ontology_files, load_graph, load_index, parse_failed, strict_parsing
+
+REUSE_COUNTS = "Reused Entities by Source"
+
+def analyze_directory_as_one_ontology(directory_path, cache=None):
     g = Graph()
     for file_path in find_ontology_files(directory_path):
         try:
-            g.parse(file_path)
+            if cache is not None:
+                cache.parse_into(g, file_path)
+            else:
+                parse_file(g, file_path)
         except Exception as e:
             print(f"Warning: could not parse {file_path}: {e}")
     return g
 
+def index_file(file_path, cache=None, streaming=False, mergeable=False, recorder=NULL_RECORDER, axioms=True):
+    if chunked(file_path):
+        with recorder.stage("load_index (chunked)"):
+            index = load_index(file_path, mergeable, axioms=axioms)
+    elif streaming:
+        with recorder.stage("load_index (streaming)"):
+            index = load_index(file_path, mergeable, axioms=axioms)
+    elif cache is not None:
+        try:
+            with recorder.stage("load_graph"):
+                arrays = cache.load_arrays(file_path)
+            with recorder.stage("index"):
+                index = arrays.to_index(mergeable, axioms)
+        except Exception as e:
+            parse_failed(file_path, e)
+            index = TripleIndex(mergeable, axioms)
+    else:
+        with recorder.stage("load_graph"):
+            g = load_graph(file_path)
+        with recorder.stage("index"):
+            index = TripleIndex.from_graph(g, mergeable, axioms)
+    recorder.triples = (recorder.triples or 0) + index.triple_count
+    return index
+
+def attach_profile(metrics, recorder, profiler):
+    if recorder.records:
+        if profiler.enabled:
+            metrics.update(recorder.columns())
+        metrics[PROFILE_RECORDS] = list(recorder.records)
+    return metrics
+
+def evaluate_work(index: TripleIndex, name, is_dir, add_other_indicators, txt_path, ontologies_base_urls, import_resolver: ImportResolver = None, path=None, exclude=(), recorder=NULL_RECORDER, indicator_options=None):
+    try:
+        if import_resolver is not None:
+            with recorder.stage("imports"):
+                for summary in import_resolver.closure(index, path or name, exclude):
+                    index.merge(summary)
+        recorder.triples = index.triple_count
+        m = Metrics(cur_filename=name, index=index, recorder=recorder)
+        metrics = m.run(add_other_indicators=add_other_indicators, ontology_c_output=txt_path, ontologies_base_urls=ontologies_base_urls, **(indicator_options or {}))
+        metrics[REUSE_COUNTS] = dict(m.reuse_counts)
+    except Exception as e:
+        print(f"Failed to evaluate {path or name}: {e}")
+        metrics = {"Error": f"{type(e).__name__}: {e}"}
+    metrics["Ontology Source"] = name
+    metrics["Source Type"] = "subdirectory" if is_dir else "file"
+    return metrics
+
+def evaluate_work_entry(path, name, is_dir, add_other_indicators, txt_path, ontologies_base_urls, import_resolver=None, cache=None, streaming=False, profiler=None, indicator_options=None):
+    """Worker task for process_work: summarizes one file or subdirectory and returns its metrics row."""
+    cache = cache.clone() if cache is not None else None
+    recorder = profiler.recorder(name) if profiler is not None else NULL_RECORDER
+    if import_resolver is not None:
+        import_resolver.cache = cache
+    with recorder.task():
+        try:
+            files = list(find_ontology_files(path)) if is_dir else [path]
+            index = TripleIndex.merged(index_file(file_path, cache, streaming, True, recorder, needs_axioms(indicator_options)) for file_path in files)
+            metrics = evaluate_work(index, name, is_dir, add_other_indicators, txt_path, ontologies_base_urls, import_resolver, path, files, recorder, indicator_options)
+        except Exception as e:
+            print(f"Failed to evaluate {path}: {e}")
+            metrics = {"Error": f"{type(e).__name__}: {e}", "Ontology Source": name, "Source Type": "subdirectory" if is_dir else "file"}
+    if profiler is not None:
+        attach_profile(metrics, recorder, profiler)
+    return metrics, None, cache.stats() if cache is not None else None
+
+def evaluate_file(file_path, root, add_other_indicators, summarize=False, cache=None, streaming=False, profiler=None, indicator_options=None):
+    """Worker task for process_file; with summarize=True it also returns the file's mergeable summary."""
+    cache = cache.clone() if cache is not None else None
+    rel_path = os.path.relpath(file_path, root)
+    recorder = profiler.recorder(rel_path) if profiler is not None else NULL_RECORDER
+    summary = None
+    with recorder.task():
+        try:
+            m = Metrics(index=index_file(file_path, cache, streaming, summarize, recorder, needs_axioms(indicator_options)), recorder=recorder)
+            metrics = m.run(add_other_indicators=add_other_indicators, **(indicator_options or {}))
+            summary = m.summary() if summarize else None
+        except Exception as e:
+            print(f"Failed to evaluate {file_path}: {e}")
+            metrics = {"Error": f"{type(e).__name__}: {e}"}
+    metrics["Ontology File"] = rel_path
+    if profiler is not None:
+        attach_profile(metrics, recorder, profiler)
+    return metrics, summary, cache.stats() if cache is not None else None
+
+def summarize_file(file_path, cache=None, streaming=False, profiler=None, indicator_options=None):
+    """Worker task for resumed runs: only the mergeable summary of a file whose metrics row is already journaled."""
+    cache = cache.clone() if cache is not None else None
+    return None, index_file(file_path, cache, streaming, mergeable=True, axioms=needs_axioms(indicator_options)), cache.stats() if cache is not None else None
+
+def aggregate_work(path, name, is_dir, add_other_indicators, txt_path, ontologies_base_urls, import_resolver, files, summaries, cache=None, streaming=False, profiler=None, indicator_options=None):
+    """Worker task for the work rows of process_all: merges the summaries of the work's files and evaluates the result."""
+    recorder = profiler.recorder(name) if profiler is not None else NULL_RECORDER
+    with recorder.task():
+        with recorder.stage("merge summaries"):
+            index = TripleIndex.merged(summaries)
+        metrics = evaluate_work(index, name, is_dir, add_other_indicators, txt_path, ontologies_base_urls, import_resolver, path, files, recorder, indicator_options)
+    if profiler is not None:
+        attach_profile(metrics, recorder, profiler)
+    return metrics, None, None
+
+def _work_failure(task, reason, elapsed):
+    _, name, is_dir = task[:3]
+    return {"Error": reason, "Wall Time (s)": elapsed, "Ontology Source": name, "Source Type": "subdirectory" if is_dir else "file"}, None, None
+
+def _file_failure(task, reason, elapsed):
+    file_path, root = task[:2]
+    return {"Error": reason, "Wall Time (s)": elapsed, "Ontology File": os.path.relpath(file_path, root)}, None, None
+
+def incomplete_work(name, is_dir, failed):
+    """Error row of a work whose files in failed (rel path -> error) were killed or failed: a merge of the rest would pass
+    for the whole work. It takes the error type of the first of them, so a work missing a killed file is evaluated again."""
+    kinds = [error.split(":")[0] for error in failed.values()]
+    files = ", ".join(f"{rel_path} ({kind})" for rel_path, kind in zip(failed, kinds))
+    return {"Error": f"{kinds[0]}: no summary of {files}", "Ontology Source": name, "Source Type": "subdirectory" if is_dir else "file"}
+
+def _summary_failure(task, reason, elapsed):
+    print(f"Failed to summarize {task[0]}: {reason}")
+    return None, None, None
+
+# Stand-in results of the worker tasks for a call killed by its Limits, or whose worker process died
+TASK_FAILURES = {evaluate_work_entry: _work_failure, aggregate_work: _work_failure, evaluate_file: _file_failure, summarize_file: _summary_failure}
+
+def run_tasks(func, tasks, jobs: int = 1, limits: Limits = None):
+    """Yields func over the argument tuples in tasks as the results come in, in a process pool when jobs > 1, keeping input order.
+
+    With limits, every call runs in its own child process under them instead (see Isolation.run_isolated).
+    When a pool worker dies (killed, crashed), the calls it left unfinished run again one at a time, which singles out
+    the one that kills its worker: that one gets the failure row of TASK_FAILURES and the rest go on.
+    """
+    if limits is not None:
+        yield from run_isolated(func, tasks, jobs, limits, TASK_FAILURES[func], strict_parsing)
+        return
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(tasks) <= 1:
+        for t in tasks:
+            yield func(*t)
+        return
+    pending, workers, results, next_k = list(range(len(tasks))), jobs, {}, 0
+    while pending:
+        broken = []
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+            futures = [(k, executor.submit(func, *tasks[k])) for k in pending]
+            for k, future in futures:
+                try:
+                    results[k] = future.result()
+                except BrokenProcessPool:
+                    broken.append(k)
+                while next_k in results:
+                    yield results.pop(next_k)
+                    next_k += 1
+        if broken and workers == 1:
+            results[broken[0]] = TASK_FAILURES[func](tasks[broken[0]], "ChildProcessError: the worker process died", None)
+            broken, workers = broken[1:], jobs
+        elif broken:
+            print(f"Warning: a worker process died; running the {len(broken)} unfinished tasks again one at a time")
+            workers = 1
+        pending = broken
+    while next_k in results:
+        yield results.pop(next_k)
+        next_k += 1
+
+def find_works(root):
+    """(entry, is_dir) for each work of root: its ontology files and subdirectories (entries have .name and .path)."""
+    if is_archive(root):
+        for entry, is_dir in archive_entries(root):
+            if is_dir or any(entry.name.endswith(ext) for ext in ONTO_EXTENSIONS):
+                yield entry, is_dir
+        return
+    for entry in os.scandir(root):
+        if entry.is_file() and any(entry.name.endswith(ext) for ext in ONTO_EXTENSIONS):
+            yield entry, False
+        elif entry.is_dir():
+            yield entry, True
+
+def work_frame(all_metrics):
+    import pandas as pd
+    df = pd.DataFrame(all_metrics)
+    source = df.pop("Ontology Source")
+    df.insert(0, "Ontology Source", source)
+    source_type = df.pop("Source Type")
+    df.insert(1, "Source Type", source_type)
+    return df
+
+def reuse_matrix(all_metrics):
+    """Pops the per-source reuse counts off the work rows into a work x source matrix of reused entity counts."""
+    import pandas as pd
+    reuse = {metrics["Ontology Source"]: metrics.pop(REUSE_COUNTS, None) or {} for metrics in all_metrics}
+    return pd.DataFrame.from_dict(reuse, orient="index").reindex(list(reuse)).fillna(0).astype(int).sort_index(axis=1)
+
+def file_frame(all_metrics):
+    import pandas as pd
+    df = pd.DataFrame(all_metrics)
+    ontology_files = df.pop("Ontology File")
+    df.insert(0, "Ontology File", ontology_files)
+    return df
+
 class OntologyEvaluator:
-    def __init__(self, root: str, ontologiesBaseURL: dict):
+    def __init__(self, root: str, ontologiesBaseURL: dict, cache: ParseCache = None, streaming: bool = False, import_resolver: ImportResolver = None, profiler: Profiler = None, journal_dir: str = None, indicator_options: dict = None, limits: Limits = None):
+        """root is a folder of works, or a zip/tar/rar archive of one whose members are parsed without extracting them.
+
+        With streaming=True, files are indexed straight from the parser without building a Graph (the parse cache is bypassed).
+
+        import_resolver is used when imports are requested; by default one is built from the catalogs and ontology IRIs found under root.
+        profiler switches on per-stage timing columns, the JSONL trace and cProfile for selected sources.
+        With journal_dir, every row is journaled to disk as soon as it is computed and a run interrupted midway resumes from there.
+        indicator_options are extra Metrics.run flags (see Indicators.indicator_options) selecting the indicator groups to compute.
+        With limits, every file and work is evaluated in its own child process under those time/memory ceilings; one that
+        exceeds them is killed (and retried as limits says), leaving an Error row with its elapsed Wall Time (s).
+        """
         self.root = root
         self.ontologiesBaseURL = ontologiesBaseURL
+        self.cache = cache
+        self.streaming = streaming
+        self.import_resolver = import_resolver
+        self.profiler = profiler
+        self.journal_dir = journal_dir
+        self.indicator_options = indicator_options
+        self.limits = limits
         self.results = None
+        self.work_results = None
+        self.file_results = None
+        self.reuse_matrix = None
 
-    def process_work(self, add_other_indicators: bool = False, ontology_c_output: str = "./", try_import_external_ontologies: bool = False):
-        all_metrics = []
-        for entry in os.scandir(self.root):
-            if entry.is_file() and any(entry.name.endswith(ext) for ext in ONTO_EXTENSIONS):
-                print(f"Analyzing single ontology file: {entry.path}")
-                txt_path = os.path.join(ontology_c_output, f"{entry.name}_classes.txt")
-                g = load_graph(entry.path)
-                if try_import_external_ontologies:
-                    try:
-                        for o in g.objects(predicate=OWL.imports):
-                            print(f"Loading import: {o}")
-                            g.parse(o)
-                    except Exception as e:
-                        print(f"Warning: could not parse {file_path}: {e}")
-                metrics = Metrics(g, entry.name).run(add_other_indicators=add_other_indicators, ontology_c_output=txt_path, ontologies_base_urls=self.ontologiesBaseURL)
-                metrics["Ontology Source"] = entry.name  # Use filename
-                metrics["Source Type"] = "file"
-                all_metrics.append(metrics)
-            elif entry.is_dir():
+    def _run(self, func, tasks, jobs, journal: ResultJournal = None):
+        results = []
+        for metrics, summary, cache_stats in run_tasks(func, [t + (self.cache, self.streaming, self.profiler, self.indicator_options) for t in tasks], jobs, self.limits):
+            if cache_stats is not None:
+                self.cache.record(cache_stats)
+            if metrics is not None:
+                self._trace(metrics)
+                if journal is not None:
+                    journal.append(metrics)
+            results.append((metrics, summary))
+        return results
+
+    def _fingerprint(self, add_other_indicators, **options):
+        return json.dumps({
+            "metrics_version": METRICS_VERSION,
+            "add_other_indicators": add_other_indicators,
+            "ontologies_base_urls": self.ontologiesBaseURL,
+            **({"indicator_options": self.indicator_options} if self.indicator_options else {}),
+            **({"allow_network_imports": True} if self.import_resolver is not None and self.import_resolver.allow_network else {}),
+            **options
+        }, sort_keys=True)
+
+    def _journal(self, name, key_column, fingerprint):
+        if self.journal_dir is None:
+            return None
+        os.makedirs(self.journal_dir, exist_ok=True)
+        journal = ResultJournal(os.path.join(self.journal_dir, f"{name}.jsonl"), key_column, fingerprint)
+        if journal.rows:
+            print(f"Resuming {name}: {len(journal.rows)} rows already done")
+        return journal
+
+    def _trace(self, metrics):
+        records = metrics.pop(PROFILE_RECORDS, None)
+        if records and self.profiler.trace_path:
+            with open(self.profiler.trace_path, "a", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+
+    def _resolver(self):
+        if self.import_resolver is None:
+            self.import_resolver = ImportResolver(cache=self.cache, streaming=self.streaming, axioms=needs_axioms(self.indicator_options))
+            self.import_resolver.add_xml_catalogs(self.root)
+        return self.import_resolver
+
+    def _works(self):
+        return find_works(self.root)
+
+    def process_work(self, add_other_indicators: bool = False, ontology_c_output: str = "./", try_import_external_ontologies: bool = False, jobs: int = 1):
+        import_resolver = None
+        if try_import_external_ontologies:
+            import_resolver = self._resolver()
+            import_resolver.add_directory(self.root)
+        journal = self._journal("Ontology Metrics Per Work", "Ontology Source", self._fingerprint(add_other_indicators, try_import_external_ontologies=try_import_external_ontologies))
+        done = dict(journal.rows) if journal is not None else {}
+        names, tasks = [], []
+        for entry, is_dir in self._works():
+            names.append(entry.name)
+            if entry.name in done:
+                continue
+            if is_dir:
                 print(f"Analyzing combined ontology for subdirectory: {entry.path}")
-                txt_path = os.path.join(ontology_c_output, f"{entry.name}_classes.txt")
-                g = analyze_directory_as_one_ontology(entry.path)
-                if try_import_external_ontologies:
-                    try:
-                        for o in g.objects(predicate=OWL.imports):
-                            print(f"Loading import: {o}")
-                            g.parse(o)
-                    except Exception as e:
-                        print(f"Warning: could not parse {file_path}: {e}")
-                metrics = Metrics(g, entry.name).run(add_other_indicators=add_other_indicators, ontology_c_output=txt_path, ontologies_base_urls=self.ontologiesBaseURL)
-                metrics["Ontology Source"] = os.path.basename(entry.path)  # Use folder name
-                metrics["Source Type"] = "subdirectory"
-                all_metrics.append(metrics)
-        df = pd.DataFrame(all_metrics)
-        source = df.pop("Ontology Source")
-        df.insert(0, "Ontology Source", source)
-        source_type = df.pop("Source Type")
-        df.insert(1, "Source Type", source_type)
-        self.results = df
-
-    def process_file(self, add_other_indicators: bool = False):
-        all_metrics = []
+            else:
+                print(f"Analyzing single ontology file: {entry.path}")
+            txt_path = os.path.join(ontology_c_output, entry.name + CLASSES_SUFFIX)
+            tasks.append((entry.path, entry.name, is_dir, add_other_indicators, txt_path, self.ontologiesBaseURL, import_resolver))
+        for metrics, _ in self._run(evaluate_work_entry, tasks, jobs, journal):
+            done[metrics["Ontology Source"]] = metrics
+        work_metrics = [done[name] for name in names]
+        self.reuse_matrix = reuse_matrix(work_metrics)
+        self.results = work_frame(work_metrics)
+        if journal is not None:
+            journal.close()
+
+    def process_file(self, add_other_indicators: bool = False, jobs: int = 1):
+        journal = self._journal("Ontology Metrics Per File", "Ontology File", self._fingerprint(add_other_indicators))
+        done = dict(journal.rows) if journal is not None else {}
+        rel_paths, tasks = [], []
         for file_path in find_ontology_files(self.root):
+            rel_paths.append(os.path.relpath(file_path, self.root))
+            if rel_paths[-1] in done:
+                continue
             print(f"Analyzing: {file_path}")
-            g = load_graph(file_path)
-            metrics = Metrics(g).run(add_other_indicators=add_other_indicators)
-            metrics["Ontology File"] = os.path.relpath(file_path, self.root)
-            all_metrics.append(metrics)
-        df = pd.DataFrame(all_metrics)
-        ontology_files = df.pop("Ontology File")
-        df.insert(0, "Ontology File", ontology_files)
-        self.results = df
-
-    def save_to_csv(self, output_csv: str):
-        self.results.to_csv(output_csv, sep=";", index=False)
-        print(f"\n✅ Metrics saved to: {output_csv}")
\ No newline at end of file
+            tasks.append((file_path, self.root, add_other_indicators, False))
+        for metrics, _ in self._run(evaluate_file, tasks, jobs, journal):
+            done[metrics["Ontology File"]] = metrics
+        self.results = file_frame([done[rel_path] for rel_path in rel_paths])
+        if journal is not None:
+            journal.close()
+
+    def _evaluate(self, file_paths, works, add_other_indicators, ontology_c_output, try_import_external_ontologies, jobs):
+        file_journal = self._journal("Ontology Metrics Per File", "Ontology File", self._fingerprint(add_other_indicators))
+        work_journal = self._journal("Ontology Metrics Per Work", "Ontology Source", self._fingerprint(add_other_indicators, try_import_external_ontologies=try_import_external_ontologies))
+        done_files = dict(file_journal.rows) if file_journal is not None else {}
+        done_works = dict(work_journal.rows) if work_journal is not None else {}
+        pending_works = {entry.name for entry, _ in works if entry.name not in done_works}
+        tasks, resumed = [], []
+        for file_path in file_paths:
+            rel_path = os.path.relpath(file_path, self.root)
+            if rel_path not in done_files:
+                print(f"Analyzing: {file_path}")
+                tasks.append((file_path, self.root, add_other_indicators, True))
+            elif try_import_external_ontologies or rel_path.split(os.sep)[0] in pending_works:
+                resumed.append((file_path,))
+        results = [(file_path, metrics["Ontology File"], metrics, summary) for (file_path, *_), (metrics, summary) in zip(tasks, self._run(evaluate_file, tasks, jobs, file_journal))]
+        results += [(file_path, os.path.relpath(file_path, self.root), None, summary) for (file_path,), (_, summary) in zip(resumed, self._run(summarize_file, resumed, jobs))]
+        import_resolver = self._resolver() if try_import_external_ontologies else None
+        summaries_per_work, files_per_work, failed_per_work = {}, {}, {}
+        for file_path, rel_path, metrics, summary in results:
+            if metrics is not None:
+                done_files[rel_path] = metrics
+            if summary is None:
+                failed_per_work.setdefault(rel_path.split(os.sep)[0], {})[rel_path] = metrics["Error"] if metrics is not None else "ChildProcessError"
+            else:
+                work = rel_path.split(os.sep)[0]
+                summaries_per_work.setdefault(work, []).append(summary)
+                files_per_work.setdefault(work, []).append(file_path)
+                if import_resolver is not None:
+                    import_resolver.add_summary(file_path, summary)
+        tasks = []
+        for entry, is_dir in works:
+            if entry.name in failed_per_work and entry.name not in done_works:
+                print(f"Failed to aggregate {entry.path}: {len(failed_per_work[entry.name])} of its files failed")
+                done_works[entry.name] = incomplete_work(entry.name, is_dir, failed_per_work[entry.name])
+                if work_journal is not None:
+                    work_journal.append(done_works[entry.name])
+            elif entry.name not in done_works:
+                print(f"Aggregating {'subdirectory' if is_dir else 'single ontology file'}: {entry.path}")
+                txt_path = os.path.join(ontology_c_output, entry.name + CLASSES_SUFFIX)
+                tasks.append((entry.path, entry.name, is_dir, add_other_indicators, txt_path, self.ontologiesBaseURL, import_resolver,
+                              files_per_work.get(entry.name, []), summaries_per_work.get(entry.name, [])))
+        # The summaries are in this process: only isolated (forked) children can share them, so a plain run merges in place
+        for metrics, _ in self._run(aggregate_work, tasks, jobs if self.limits is not None else 1, work_journal):
+            done_works[metrics["Ontology Source"]] = metrics
+        work_metrics = [done_works[entry.name] for entry, _ in works]
+        file_metrics = [done_files[os.path.relpath(file_path, self.root)] for file_path in file_paths]
+        for journal in (file_journal, work_journal):
+            if journal is not None:
+                journal.close()
+        return file_metrics, work_metrics
+
+    def process_all(self, add_other_indicators: bool = False, ontology_c_output: str = "./", try_import_external_ontologies: bool = False, jobs: int = 1):
+        """Parses every file once and derives both the per-file and the per-work results from per-file summaries.
+
+        Sets self.file_results and self.work_results (self.results is left as the per-work frame).
+        """
+        file_metrics, work_metrics = self._evaluate(list(find_ontology_files(self.root)), list(self._works()), add_other_indicators, ontology_c_output, try_import_external_ontologies, jobs)
+        self.reuse_matrix = reuse_matrix(work_metrics)
+        self.file_results = file_frame(file_metrics)
+        self.work_results = work_frame(work_metrics)
+        self.results = self.work_results
+
+    def process_incremental(self, work_csv: str, file_csv: str, manifest_path: str = None, add_other_indicators: bool = False, ontology_c_output: str = "./", try_import_external_ontologies: bool = False, jobs: int = 1):
+        """Like process_all, but only re-evaluates the files changed since work_csv/file_csv were written and the works containing them.
+
+        Changes are detected with a Manifest stored next to the results; a different METRICS_VERSION, base URL map or option set
+        recomputes everything. With imports enabled any change recomputes every work, as imports cross work boundaries.
+        Both result files (CSV, or Parquet/Arrow by extension) and the manifest are written back.
+        """
+        manifest_path = manifest_path or os.path.join(os.path.dirname(file_csv), "Ontology Metrics Manifest.json")
+        fingerprint = self._fingerprint(add_other_indicators, try_import_external_ontologies=try_import_external_ontologies)
+        manifest = Manifest.load(manifest_path)
+        if manifest.fingerprint != fingerprint or not (os.path.isfile(work_csv) and os.path.isfile(file_csv)):
+            manifest = Manifest(manifest_path, fingerprint)
+            old_files, old_works = {}, {}
+        else:
+            old_files = {row["Ontology File"]: row for row in read_results(file_csv).to_dict("records")}
+            old_works = {row["Ontology Source"]: row for row in read_results(work_csv).to_dict("records")}
+        file_paths = list(find_ontology_files(self.root))
+        rel_paths = [os.path.relpath(file_path, self.root) for file_path in file_paths]
+        works = list(self._works())
+        changed, removed = manifest.diff(self.root, rel_paths)
+        affected = {rel_path.split(os.sep)[0] for rel_path in changed + removed}
+        affected |= {entry.name for entry, _ in works if entry.name not in old_works}
+        affected |= {rel_path.split(os.sep)[0] for rel_path in rel_paths if rel_path not in old_files}
+        affected |= {name for name, row in old_works.items() if hit_limit(row)}
+        if affected and try_import_external_ontologies:
+            affected = {entry.name for entry, _ in works}
+        stale_works = set(old_works) - {entry.name for entry, _ in works}
+        if not affected and not stale_works:
+            print(f"Up to date: {len(rel_paths)} files unchanged")
+        else:
+            print(f"Re-evaluating {len(changed)} changed and {len(removed)} removed files in {len(affected)} works")
+        file_metrics, work_metrics = self._evaluate(
+            [file_path for file_path, rel_path in zip(file_paths, rel_paths) if rel_path.split(os.sep)[0] in affected],
+            [(entry, is_dir) for entry, is_dir in works if entry.name in affected],
+            add_other_indicators, ontology_c_output, try_import_external_ontologies, jobs)
+        self.reuse_matrix = reuse_matrix(work_metrics)
+        new_files = {metrics["Ontology File"]: metrics for metrics in file_metrics}
+        new_works = {metrics["Ontology Source"]: metrics for metrics in work_metrics}
+        self.file_results = file_frame([new_files.get(rel_path) or old_files[rel_path] for rel_path in rel_paths])
+        self.work_results = work_frame([new_works.get(entry.name) or old_works[entry.name] for entry, _ in works])
+        self.results = self.work_results
+        for rel_path in removed:
+            manifest.forget(rel_path)
+        for rel_path, metrics in new_files.items():
+            if hit_limit(metrics):
+                manifest.forget(rel_path)
+            else:
+                manifest.record(self.root, rel_path)
+        if affected or stale_works:
+            self.save_results(work_csv, self.work_results)
+            self.save_results(file_csv, self.file_results)
+        manifest.save()
+
+    def save_reuse_matrix(self, output_csv: str):
+        self.reuse_matrix.to_csv(output_csv, sep=";", index_label="Ontology Source")
+        print(f"\n✅ Reuse matrix saved to: {output_csv}")
+
+    def save_results(self, output_path: str, results: "pandas.DataFrame" = None):
+        """Saves results as CSV, Parquet (.parquet) or Arrow IPC (.arrow/.feather); the columnar formats need pyarrow."""
+        results = self.results if results is None else results
+        write_results(results, output_path)
+        print(f"\n✅ Metrics saved to: {output_path}")
+
+    def save_to_csv(self, output_csv: str, results: "pandas.DataFrame" = None):
+        self.save_results(output_csv, results)
@@ -0,0 +1,52 @@
+from collections import defaultdict
+
+def longest_paths(adjacency: dict, nodes=None):
+    """Number of nodes on the longest path starting at each node, by iterative memoized DFS.
+
+    Each edge is followed once, so the cost is linear in the edges. An edge leading back to a node
+    still on the DFS stack closes a cycle and is ignored.
+    """
+    memo = {}
+    on_stack = set()
+    for start in (adjacency if nodes is None else nodes):
+        if start in memo:
+            continue
+        on_stack.add(start)
+        stack = [(start, iter(adjacency.get(start, ())))]
+        while stack:
+            node, successors = stack[-1]
+            for successor in successors:
+                if successor not in memo and successor not in on_stack:
+                    on_stack.add(successor)
+                    stack.append((successor, iter(adjacency.get(successor, ()))))
+                    break
+            else:
+                stack.pop()
+                on_stack.discard(node)
+                memo[node] = 1 + max((memo[m] for m in adjacency.get(node, ()) if m in memo), default=0)
+    return memo
+
+class SubclassHierarchy:
+    """rdfs:subClassOf adjacency built once from the child -> superclasses map of a TripleIndex."""
+    def __init__(self, superclasses: dict, classes: set):
+        self.classes = classes
+        self.parents = superclasses
+        self.children = defaultdict(list)
+        for child, parents in superclasses.items():
+            for parent in parents:
+                self.children[parent].append(child)
+
+    def heights(self):
+        """Longest descending chain below every node, over all subClassOf edges (class expressions included)."""
+        return longest_paths(self.children)
+
+    def depths(self):
+        """Level of every declared class counted from its topmost declared superclass (roots are at depth 1)."""
+        class_parents = {c: [p for p in self.parents.get(c, ()) if p in self.classes] for c in self.classes}
+        return longest_paths(class_parents)
+
+    def roots(self):
+        return [c for c in self.classes if not any(p in self.classes for p in self.parents.get(c, ()))]
+
+    def leaves(self):
+        return [c for c in self.classes if c not in self.children]
@@ -0,0 +1,169 @@
+import datetime, hashlib, math, numbers, os, sqlite3
+import pandas as pd
+from Assets.Archives import source_exists, source_stat
+from Assets.Cache import file_hash
+from Assets.Manifest import Manifest
+from Assets.Metrics import METRICS_VERSION
+
+KEY_COLUMNS = {"work": "Ontology Source", "file": "Ontology File"}
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY, created_at TEXT NOT NULL, label TEXT UNIQUE, metrics_version TEXT
+);
+CREATE TABLE IF NOT EXISTS ontologies (id INTEGER PRIMARY KEY, level TEXT NOT NULL, name TEXT NOT NULL, UNIQUE (level, name));
+CREATE TABLE IF NOT EXISTS metrics (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS snapshots (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE, ontology_id INTEGER NOT NULL REFERENCES ontologies(id),
+    content_hash TEXT, PRIMARY KEY (run_id, ontology_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rows (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE, ontology_id INTEGER NOT NULL REFERENCES ontologies(id),
+    metric_id INTEGER NOT NULL REFERENCES metrics(id), value REAL, text TEXT, PRIMARY KEY (run_id, ontology_id, metric_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rows_by_ontology ON rows (ontology_id, metric_id, run_id);
+CREATE INDEX IF NOT EXISTS rows_by_metric ON rows (metric_id, run_id);
+"""
+
+def _cell(value):
+    """(value, text) stored for one metric cell; (None, None) for missing values."""
+    if isinstance(value, str):
+        return None, value
+    if isinstance(value, numbers.Number) and not (isinstance(value, float) and math.isnan(value)):
+        return float(value), None
+    return None, None
+
+class HistoryStore:
+    """SQLite history of evaluation runs: one row per (run, ontology, metric) value, plus each ontology's content hash per run.
+
+    Trends and run-to-run diffs are answered from the indexes, without reading any result CSV again.
+    Runs can carry a unique label (e.g. a release tag); diffs default to "since the last labeled run".
+    """
+    def __init__(self, path: str = "MetricsResults/Ontology Metrics History.sqlite"):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA foreign_keys=ON")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    @staticmethod
+    def content_hashes(root: str, rel_paths, manifest: Manifest = None):
+        """sha256 per file, taken from manifest for files whose size and mtime still match it."""
+        hashes = {}
+        for rel_path in rel_paths:
+            path = os.path.join(root, rel_path)
+            if not source_exists(path):
+                continue
+            entry = manifest.files.get(rel_path) if manifest is not None else None
+            if entry is not None and (entry["size"], entry["mtime"]) == tuple(source_stat(path)):
+                hashes[rel_path] = entry["sha256"]
+            else:
+                hashes[rel_path] = file_hash(path)
+        return hashes
+
+    @staticmethod
+    def work_hashes(file_hashes: dict):
+        """Hash of each work (first path component) over the sorted (path, hash) pairs of its files."""
+        per_work = {}
+        for rel_path in sorted(file_hashes):
+            per_work.setdefault(rel_path.replace("\\", "/").split("/")[0], []).append(f"{rel_path}:{file_hashes[rel_path]}")
+        return {work: hashlib.sha256("\n".join(entries).encode()).hexdigest() for work, entries in per_work.items()}
+
+    def _id(self, table, cache, *key):
+        if key not in cache:
+            columns = ("level", "name") if table == "ontologies" else ("name",)
+            where = " AND ".join(f"{column} = ?" for column in columns)
+            self.db.execute(f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})", key)
+            cache[key] = self.db.execute(f"SELECT id FROM {table} WHERE {where}", key).fetchone()[0]
+        return cache[key]
+
+    def record_run(self, work_results, file_results, file_hashes: dict = None, label: str = None, created_at: str = None):
+        """Stores the per-work and per-file rows of one run and returns its id."""
+        file_hashes = file_hashes or {}
+        content = {"work": self.work_hashes(file_hashes), "file": file_hashes}
+        created_at = created_at or datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+        ontology_ids, metric_ids = {}, {}
+        with self.db:
+            run_id = self.db.execute("INSERT INTO runs (created_at, label, metrics_version) VALUES (?, ?, ?)",
+                                     (created_at, label, METRICS_VERSION)).lastrowid
+            for level, results in (("work", work_results), ("file", file_results)):
+                if results is None:
+                    continue
+                key = KEY_COLUMNS[level]
+                snapshots, rows = [], []
+                for row in results.to_dict("records"):
+                    ontology_id = self._id("ontologies", ontology_ids, level, row[key])
+                    snapshots.append((run_id, ontology_id, content[level].get(row[key])))
+                    for metric, value in row.items():
+                        value, text = _cell(value)
+                        if metric != key and (value is not None or text is not None):
+                            rows.append((run_id, ontology_id, self._id("metrics", metric_ids, metric), value, text))
+                self.db.executemany("INSERT INTO snapshots VALUES (?, ?, ?)", snapshots)
+                self.db.executemany("INSERT INTO rows VALUES (?, ?, ?, ?, ?)", rows)
+        return run_id
+
+    def tag(self, run, label: str):
+        with self.db:
+            self.db.execute("UPDATE runs SET label = ? WHERE id = ?", (label, self.run_id(run)))
+
+    def run_id(self, run):
+        """Id of a run given as an id, a label, or None for the latest run."""
+        if run is None:
+            row = self.db.execute("SELECT MAX(id) FROM runs").fetchone()
+        elif isinstance(run, int) or str(run).isdigit():
+            row = self.db.execute("SELECT id FROM runs WHERE id = ?", (int(run),)).fetchone()
+        else:
+            row = self.db.execute("SELECT id FROM runs WHERE label = ?", (run,)).fetchone()
+        if row is None or row[0] is None:
+            raise ValueError(f"No such run: {run}" if run is not None else "The history is empty")
+        return row[0]
+
+    def runs(self, last: int = None):
+        query = "SELECT id, created_at, label, metrics_version FROM runs ORDER BY id DESC"
+        frame = pd.read_sql_query(query + (" LIMIT ?" if last else ""), self.db, params=(last,) if last else ())
+        return frame.iloc[::-1].reset_index(drop=True)
+
+    def trend(self, ontology: str, metric: str, last: int = 50, level: str = "work"):
+        """Value of metric for ontology in each of the last runs that evaluated it, oldest first."""
+        frame = pd.read_sql_query("""
+            SELECT r.run_id, runs.created_at, runs.label, s.content_hash, r.value, r.text
+            FROM ontologies o JOIN metrics m ON m.name = :metric
+            JOIN rows r ON r.ontology_id = o.id AND r.metric_id = m.id JOIN runs ON runs.id = r.run_id
+            LEFT JOIN snapshots s ON s.run_id = r.run_id AND s.ontology_id = o.id
+            WHERE o.level = :level AND o.name = :ontology ORDER BY r.run_id DESC LIMIT :last""",
+            self.db, params={"level": level, "ontology": ontology, "metric": metric, "last": last})
+        return frame.iloc[::-1].reset_index(drop=True)
+
+    def baseline(self, new_id: int):
+        """Latest labeled run before new_id, or the run just before it when none is labeled."""
+        row = self.db.execute("SELECT MAX(id) FROM runs WHERE id < ? AND label IS NOT NULL", (new_id,)).fetchone()
+        if row[0] is None:
+            row = self.db.execute("SELECT MAX(id) FROM runs WHERE id < ?", (new_id,)).fetchone()
+        if row[0] is None:
+            raise ValueError(f"No run before run {new_id} to compare with")
+        return row[0]
+
+    def diff(self, since=None, until=None, level: str = "work"):
+        """Metric cells that differ between two runs, including ontologies and metrics present in only one of them."""
+        new_id = self.run_id(until)
+        old_id = self.run_id(since) if since is not None else self.baseline(new_id)
+        frame = pd.read_sql_query("""
+            WITH old AS (SELECT r.* FROM rows r JOIN ontologies o ON o.id = r.ontology_id WHERE r.run_id = :old AND o.level = :level),
+                 new AS (SELECT r.* FROM rows r JOIN ontologies o ON o.id = r.ontology_id WHERE r.run_id = :new AND o.level = :level),
+                 changed AS (
+                     SELECT COALESCE(new.ontology_id, old.ontology_id) AS ontology_id, COALESCE(new.metric_id, old.metric_id) AS metric_id,
+                            old.value AS old_value, new.value AS new_value, old.text AS old_text, new.text AS new_text
+                     FROM old FULL OUTER JOIN new ON new.ontology_id = old.ontology_id AND new.metric_id = old.metric_id
+                     WHERE old.value IS NOT new.value OR old.text IS NOT new.text)
+            SELECT o.name AS ontology, m.name AS metric, c.old_value, c.new_value, c.new_value - c.old_value AS delta,
+                   c.old_text, c.new_text, so.content_hash IS NOT sn.content_hash AS content_changed
+            FROM changed c JOIN ontologies o ON o.id = c.ontology_id JOIN metrics m ON m.id = c.metric_id
+            LEFT JOIN snapshots so ON so.run_id = :old AND so.ontology_id = c.ontology_id
+            LEFT JOIN snapshots sn ON sn.run_id = :new AND sn.ontology_id = c.ontology_id
+            ORDER BY ontology, metric""", self.db, params={"old": old_id, "new": new_id, "level": level})
+        frame["content_changed"] = frame["content_changed"].astype(bool)
+        frame.attrs.update(old_run=old_id, new_run=new_id)
+        return frame
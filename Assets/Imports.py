@@ -0,0 +1,142 @@
+import fnmatch, json, os
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
+from rdflib import Graph
+from Assets.Archives import archive_files, open_source, source_exists
+from Assets.Index import TripleIndex
+from Assets.Utils import find_ontology_files, load_graph, load_index
+
+CATALOG_NS = "{urn:oasis:names:tc:entity:xmlns:xml:catalog}"
+
+def normalize_iri(iri):
+    return str(iri).rstrip("#/")
+
+class ImportResolver:
+    """Resolves the transitive owl:imports closure of an ontology from local files.
+
+    Import IRIs are mapped to files through a catalog filled from XML catalogs (catalog-v001.xml), JSON
+    maps of IRI -> path, and the ontology/version IRIs declared by the files of a directory. Every import
+    is parsed at most once per resolver, so works sharing imports reuse the same summary; the files read by
+    add_directory are kept as summaries too. With allow_network, imports that resolve to no local file are
+    fetched from their IRI, up to jobs at a time; local files are parsed in turn, as rdflib parsing holds the GIL.
+    """
+    def __init__(self, catalog: dict = None, cache=None, streaming: bool = False, jobs: int = 4, allow_network: bool = False, axioms: bool = True):
+        self.catalog = {normalize_iri(iri): path for iri, path in (catalog or {}).items()}
+        self.cache = cache
+        self.streaming = streaming
+        self.jobs = jobs
+        self.allow_network = allow_network
+        self.axioms = axioms
+        self.summaries = {}
+        self.unresolved = set()
+
+    @classmethod
+    def for_directory(cls, directory, cache=None, streaming: bool = False, **kwargs):
+        resolver = cls(cache=cache, streaming=streaming, **kwargs)
+        resolver.add_xml_catalogs(directory)
+        resolver.add_directory(directory)
+        return resolver
+
+    def add_xml_catalog(self, catalog_path):
+        base = os.path.dirname(catalog_path)
+        with open_source(catalog_path) as f:
+            root = ET.parse(f).getroot()
+        for uri in root.iter(f"{CATALOG_NS}uri"):
+            name, target = uri.get("name"), uri.get("uri")
+            if name and target:
+                self.catalog[normalize_iri(name)] = os.path.normpath(os.path.join(base, unquote(target)))
+
+    def add_xml_catalogs(self, directory, pattern: str = "catalog*.xml"):
+        paths = archive_files(directory)
+        if paths is None:
+            paths = [os.path.join(root, file) for root, _, files in os.walk(directory) for file in files]
+        for path in paths:
+            if fnmatch.fnmatch(os.path.basename(path), pattern):
+                try:
+                    self.add_xml_catalog(path)
+                except ET.ParseError as e:
+                    print(f"Warning: could not read catalog {path}: {e}")
+
+    def add_json_catalog(self, json_path):
+        """JSON object of import IRI -> file path, relative paths being taken from the JSON file's folder."""
+        base = os.path.dirname(json_path)
+        with open(json_path, encoding="utf-8") as f:
+            for iri, path in json.load(f).items():
+                self.catalog[normalize_iri(iri)] = os.path.normpath(os.path.join(base, path))
+
+    def add_summary(self, file_path, summary: TripleIndex):
+        """Registers an already indexed file under the ontology and version IRIs it declares."""
+        self.summaries[file_path] = summary
+        for iri in summary.ontology_iris():
+            self.catalog.setdefault(normalize_iri(iri), file_path)
+
+    def add_directory(self, directory):
+        for file_path in find_ontology_files(directory):
+            if file_path not in self.summaries:
+                summary = self._parse(file_path)
+                if summary is not None:
+                    self.add_summary(file_path, summary)
+
+    def resolve(self, iri):
+        path = self.catalog.get(normalize_iri(iri))
+        if path is not None and source_exists(path):
+            return path
+        return str(iri) if self.allow_network else None
+
+    def _parse(self, source):
+        if source_exists(source):
+            if self.streaming:
+                return load_index(source, mergeable=True, axioms=self.axioms)
+            return TripleIndex.from_graph(load_graph(source, self.cache), True, self.axioms)
+        g = Graph()
+        try:
+            g.parse(source)
+        except Exception as e:
+            print(f"Warning: could not parse import {source}: {e}")
+            return None
+        return TripleIndex.from_graph(g, True, self.axioms)
+
+    def closure(self, index: TripleIndex, source=None, exclude=()):
+        """Summaries of every ontology transitively imported by index, in breadth-first order.
+
+        Imports that resolve to one of the exclude paths (the files of the work itself) or to an
+        ontology already visited are skipped, which also breaks import cycles.
+        """
+        seen = {normalize_iri(iri) for iri in index.ontology_iris()}
+        loaded = set(exclude)
+        frontier = list(index.imports)
+        result = []
+        while frontier:
+            level = []
+            for iri in frontier:
+                key = normalize_iri(iri)
+                if key in seen:
+                    continue
+                seen.add(key)
+                target = self.resolve(iri)
+                if target is None:
+                    self.unresolved.add(str(iri))
+                    print(f"Warning: could not resolve import {iri} of {source}")
+                elif target not in loaded:
+                    loaded.add(target)
+                    level.append(target)
+            pending = [target for target in level if target not in self.summaries]
+            remote = [target for target in pending if not source_exists(target)]
+            for target in pending:
+                if target not in remote:
+                    self.summaries[target] = self._parse(target)
+            if remote:
+                with ThreadPoolExecutor(max_workers=max(1, min(self.jobs, len(remote)))) as executor:
+                    for target, summary in zip(remote, executor.map(self._parse, remote)):
+                        self.summaries[target] = summary
+            frontier = []
+            for target in level:
+                summary = self.summaries[target]
+                if summary is None:
+                    continue
+                print(f"Loading import: {target}")
+                result.append(summary)
+                seen |= {normalize_iri(iri) for iri in summary.ontology_iris()}
+                frontier.extend(summary.imports)
+        return result
@@ -0,0 +1,155 @@
+from collections import Counter, defaultdict
+from rdflib import Graph, BNode, URIRef, RDF, RDFS, OWL, XSD
+
+AXIOM_PREDICATES = {
+    RDF.type, RDFS.subClassOf, OWL.equivalentClass, OWL.disjointWith,
+    RDFS.domain, RDFS.range, OWL.inverseOf, OWL.complementOf,
+    OWL.intersectionOf, OWL.unionOf, OWL.sameAs,
+    OWL.hasValue, OWL.allValuesFrom, OWL.someValuesFrom,
+    OWL.minCardinality, OWL.maxCardinality, OWL.cardinality,
+    OWL.minQualifiedCardinality, OWL.maxQualifiedCardinality, OWL.qualifiedCardinality
+}
+CARDINALITY_PREDICATES = [
+    OWL.minCardinality, OWL.maxCardinality, OWL.cardinality,
+    OWL.minQualifiedCardinality, OWL.maxQualifiedCardinality, OWL.qualifiedCardinality
+]
+TRACKED_TYPES = {
+    OWL.Class, RDFS.Class, OWL.ObjectProperty, OWL.DatatypeProperty,
+    OWL.FunctionalProperty, OWL.InverseFunctionalProperty, OWL.Ontology
+}
+TRACKED_SUBJECTS = {RDFS.label, RDFS.comment, RDFS.domain, RDFS.range}
+REASONING_PREDICATES = {
+    RDFS.subClassOf, OWL.equivalentClass, OWL.disjointWith, OWL.disjointUnionOf, OWL.members,
+    OWL.complementOf, OWL.intersectionOf, OWL.unionOf, OWL.oneOf, OWL.onProperty, OWL.onClass,
+    OWL.someValuesFrom, OWL.allValuesFrom, OWL.hasValue, RDFS.subPropertyOf, OWL.inverseOf,
+    RDFS.domain, RDFS.range, RDF.first, RDF.rest, *CARDINALITY_PREDICATES
+}
+REASONING_TYPES = {OWL.AllDisjointClasses, OWL.Nothing}
+BUILTIN_NAMESPACES = (str(RDF), str(RDFS), str(OWL), str(XSD))
+# Returned for absent keys: reads never insert into the defaultdicts, so an index can be shared between threads
+EMPTY = frozenset()
+
+def is_reasoning_type(rdf_type):
+    """rdf:type objects the reasoner needs: individuals' classes plus owl:AllDisjointClasses and owl:Nothing."""
+    return rdf_type in REASONING_TYPES or (isinstance(rdf_type, URIRef) and not str(rdf_type).startswith(BUILTIN_NAMESPACES))
+
+def is_schema_type(rdf_type):
+    """rdf:type objects from the RDF/RDFS/OWL/XSD vocabularies, i.e. declarations rather than individuals' classes."""
+    return isinstance(rdf_type, URIRef) and str(rdf_type).startswith(BUILTIN_NAMESPACES)
+
+def is_ground(s, p, o):
+    """Whether a mergeable index keeps the triple itself: blank-node-free axioms, rdf:type only for declarations."""
+    return p in AXIOM_PREDICATES and not isinstance(s, BNode) and not isinstance(o, BNode) and (p != RDF.type or is_schema_type(o))
+
+class TripleIndex:
+    """Per-predicate counters, typed entity sets and documentation flags collected in one pass over the triples.
+
+    A mergeable index also keeps the blank-node-free axiom triples themselves, so that merging the
+    indexes of several files counts a triple declared in more than one module once, exactly like
+    parsing all of them into a single Graph would. rdf:type triples of individuals are only counted, so
+    an individual typed in several modules counts once per module. The class and property axioms the
+    Reasoner works on, blank-node class expressions included, are kept in axioms unless axioms=False.
+    """
+    def __init__(self, mergeable: bool = False, axioms: bool = True):
+        self.mergeable = mergeable
+        self.keep_axioms = axioms
+        self.triple_count = 0
+        self.predicate_counts = Counter()
+        self.ground = defaultdict(set)
+        self.typed = defaultdict(set)
+        self.subjects_with = defaultdict(set)
+        self.imports = set()
+        self.version_iris = set()
+        self.superclasses = defaultdict(set)
+        self.axioms = set()
+
+    @classmethod
+    def from_graph(cls, g: Graph, mergeable: bool = False, axioms: bool = True):
+        index = cls(mergeable, axioms)
+        for s, p, o in g:
+            index.add(s, p, o)
+        return index
+
+    @classmethod
+    def merged(cls, indexes):
+        index = cls(mergeable=True)
+        for other in indexes:
+            index.merge(other)
+        return index
+
+    def add(self, s, p, o):
+        self.triple_count += 1
+        if self.keep_axioms and (p in REASONING_PREDICATES or (p == RDF.type and is_reasoning_type(o))):
+            self.axioms.add((s, p, o))
+        if self.mergeable and is_ground(s, p, o):
+            self.ground[p].add((s, o))
+        else:
+            self.predicate_counts[p] += 1
+        if p == RDF.type:
+            if o in TRACKED_TYPES:
+                self.typed[o].add(s)
+        elif p in TRACKED_SUBJECTS:
+            self.subjects_with[p].add(s)
+        elif p == RDFS.subClassOf:
+            self.superclasses[s].add(o)
+        elif p == OWL.imports:
+            self.imports.add(o)
+        elif p == OWL.versionIRI:
+            self.version_iris.add(o)
+
+    def merge(self, other):
+        """Unions other into this index. Blank nodes are never shared between parsed files, so their triples simply add up."""
+        if not (self.mergeable and other.mergeable):
+            raise ValueError("Only indexes built with mergeable=True can be merged")
+        self.triple_count += other.triple_count
+        self.predicate_counts.update(other.predicate_counts)
+        for key, values in other.ground.items():
+            self.ground[key] |= values
+        for key, values in other.typed.items():
+            self.typed[key] |= values
+        for key, values in other.subjects_with.items():
+            self.subjects_with[key] |= values
+        for key, values in other.superclasses.items():
+            self.superclasses[key] |= values
+        self.imports |= other.imports
+        self.version_iris |= other.version_iris
+        self.axioms |= other.axioms
+        return self
+
+    def count(self, *predicates):
+        return sum(self.predicate_counts[p] + len(self.ground.get(p, EMPTY)) for p in predicates)
+
+    def entities(self):
+        obj_props = self.typed.get(OWL.ObjectProperty, EMPTY)
+        data_props = self.typed.get(OWL.DatatypeProperty, EMPTY)
+        return {
+            "classes": self.typed.get(OWL.Class, EMPTY) | self.typed.get(RDFS.Class, EMPTY),
+            "obj_props": obj_props,
+            "data_props": data_props,
+            "all_props": obj_props | data_props,
+            "total_properties": len(obj_props) + len(data_props)
+        }
+
+    def ontology_iris(self):
+        return self.typed.get(OWL.Ontology, EMPTY) | self.version_iris
+
+    def labeled(self):
+        return self.subjects_with.get(RDFS.label, EMPTY)
+
+    def commented(self):
+        return self.subjects_with.get(RDFS.comment, EMPTY)
+
+class IndexSink(Graph):
+    """Graph stand-in handed to rdflib parsers: each triple is fed to a TripleIndex as it is parsed and never stored."""
+    def __init__(self, index: TripleIndex):
+        super().__init__()
+        self.index = index
+
+    def add(self, triple):
+        self.index.add(*triple)
+        return self
+
+    def addN(self, quads):
+        for s, p, o, _ in quads:
+            self.index.add(s, p, o)
+        return self
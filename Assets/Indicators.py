@@ -0,0 +1,20 @@
+"""Indicator groups of Metrics.run, importable without rdflib so that the command line parser stays light."""
+
+# Indicator group names, as given on the command line, to the Metrics.run flag selecting each
+INDICATOR_GROUPS = {
+    "structural": "structural_metrics", "lexical": "lexical_metrics", "logical": "logical_indicators",
+    "constraint": "constraint_indicators", "hierarchy": "hierarchy_indicators", "reasoning": "reasoning_indicators"
+}
+
+def indicator_options(groups):
+    """Metrics.run flags computing only the named indicator groups; None (every group) when groups is empty."""
+    if not groups:
+        return None
+    unknown = set(groups) - set(INDICATOR_GROUPS)
+    if unknown:
+        raise ValueError(f"Unknown indicator groups: {', '.join(sorted(unknown))} (choose from {', '.join(INDICATOR_GROUPS)})")
+    return {flag: name in groups for name, flag in INDICATOR_GROUPS.items()}
+
+def needs_axioms(options):
+    """Whether Metrics.run with these flags runs the reasoner, whose axiom triples an index then has to keep."""
+    return (options or {}).get("reasoning_indicators", True)
@@ -0,0 +1,124 @@
+"""Runs per-ontology tasks in child processes under wall-clock and memory ceilings, so that one pathological file
+(a parser that never returns, a graph that fills the memory) costs one failure row instead of stalling the batch."""
+import multiprocessing, os, signal, time
+from collections import deque
+from multiprocessing.connection import wait
+try:
+    import resource
+except ImportError:  # Windows: only the wall-clock limit applies
+    resource = None
+
+# Error prefixes of rows whose task hit a limit (or died); incremental runs evaluate those again
+LIMIT_ERRORS = ("TimeoutError", "MemoryError", "ChildProcessError")
+
+def hit_limit(row):
+    """Whether a metrics row records a task killed by a limit, or that ran out of memory."""
+    error = row.get("Error") if isinstance(row, dict) else None
+    return isinstance(error, str) and error.startswith(LIMIT_ERRORS)
+
+class Limits:
+    """Ceilings of one isolated task: wall-clock seconds and address space in MiB (None for no limit).
+
+    A task that hits one is run again up to retries more times, each attempt with both limits multiplied by growth.
+    """
+    def __init__(self, seconds: float = None, memory_mb: int = None, retries: int = 0, growth: float = 2.0):
+        self.seconds = seconds
+        self.memory_mb = memory_mb
+        self.retries = retries
+        self.growth = growth
+
+    def scaled(self, attempt: int):
+        factor = self.growth ** attempt
+        return (self.seconds * factor if self.seconds else None), (int(self.memory_mb * factor) if self.memory_mb else None)
+
+def _child(conn, func, args, memory_mb, initializer):
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    if memory_mb and resource is not None:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        limit = memory_mb << 20
+        resource.setrlimit(resource.RLIMIT_AS, (limit if hard == resource.RLIM_INFINITY else min(limit, hard), hard))
+    try:
+        if initializer is not None:
+            initializer()
+        result = func(*args)
+        # The evaluate_* tasks turn exceptions into Error rows, a MemoryError included
+        conn.send(("memory", None) if isinstance(result, tuple) and result and hit_limit(result[0]) else ("ok", result))
+    except MemoryError:
+        conn.send(("memory", None))
+    conn.close()
+
+def _kill(process):
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+    process.join()
+
+def run_isolated(func, tasks, jobs, limits: Limits, failure, initializer=None):
+    """Yields func over the argument tuples in tasks (each starting with the path evaluated), in input order, each call
+    in its own child process under limits.
+
+    A call past its wall-clock limit is killed together with any process it started; one that runs out of memory or
+    dies is reaped. Either is retried as limits says, and when the attempts run out failure(task, reason, elapsed)
+    stands in for its result. Children may start processes of their own (parallel parsing), so they are not daemonic:
+    the process group of each is killed instead. initializer, if given, runs in every child before func.
+    """
+    context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+    jobs = max(jobs or os.cpu_count() or 1, 1)
+    pending = deque((k, 0) for k in range(len(tasks)))
+    running, results, next_k = {}, {}, 0
+    try:
+        while pending or running:
+            while pending and len(running) < jobs:
+                k, attempt = pending.popleft()
+                seconds, memory_mb = limits.scaled(attempt)
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(target=_child, args=(sender, func, tasks[k], memory_mb, initializer))
+                process.start()
+                sender.close()
+                started = time.monotonic()
+                running[receiver] = (k, attempt, process, started, seconds, memory_mb)
+            deadlines = [started + seconds for _, _, _, started, seconds, _ in running.values() if seconds]
+            wait(list(running), max(min(deadlines) - time.monotonic(), 0) if deadlines else None)
+            now = time.monotonic()
+            for receiver, (k, attempt, process, started, seconds, memory_mb) in list(running.items()):
+                if receiver.poll():
+                    try:
+                        outcome, result = receiver.recv()
+                    except EOFError:
+                        outcome, result = "died", None
+                elif seconds and now >= started + seconds:
+                    outcome, result = "time", None
+                else:
+                    continue
+                del running[receiver]
+                receiver.close()
+                elapsed = now - started
+                if outcome == "ok":
+                    process.join()
+                    results[k] = result
+                    continue
+                _kill(process)
+                if outcome == "time":
+                    reason = f"TimeoutError: killed after {elapsed:.1f} s, over the {seconds:g} s limit"
+                elif outcome == "memory":
+                    reason = f"MemoryError: over the {memory_mb} MiB limit after {elapsed:.1f} s" if memory_mb else f"MemoryError: out of memory after {elapsed:.1f} s"
+                elif process.exitcode is not None and process.exitcode < 0:
+                    reason = f"ChildProcessError: killed by signal {-process.exitcode} after {elapsed:.1f} s"
+                else:
+                    reason = f"ChildProcessError: exited with code {process.exitcode} after {elapsed:.1f} s"
+                if attempt < limits.retries:
+                    print(f"Warning: {tasks[k][0]}: {reason}; retrying with higher limits")
+                    pending.append((k, attempt + 1))
+                else:
+                    results[k] = failure(tasks[k], reason + (f" (attempt {attempt + 1})" if attempt else ""), round(elapsed, 3))
+            while next_k in results:
+                yield results.pop(next_k)
+                next_k += 1
+    finally:
+        for _, _, process, *_ in running.values():
+            _kill(process)
@@ -0,0 +1,51 @@
+import json, os
+from Assets.Archives import source_stat
+from Assets.Cache import file_hash
+
+class Manifest:
+    """Size, mtime and content hash of every evaluated file, plus a fingerprint of the code and options that produced the results.
+
+    A file whose size and mtime are unchanged is trusted without hashing; otherwise it only counts as changed when its hash differs.
+    """
+    def __init__(self, path: str, fingerprint: str = None, files: dict = None):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.files = files or {}
+
+    @classmethod
+    def load(cls, path: str):
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(path)
+        return cls(path, data.get("fingerprint"), data.get("files", {}))
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": self.fingerprint, "files": self.files}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def diff(self, root: str, rel_paths):
+        """Returns (changed, removed) relative paths; changed includes new files. Entries of hash-identical files are refreshed."""
+        changed = []
+        for rel_path in rel_paths:
+            size, mtime = source_stat(os.path.join(root, rel_path))
+            entry = self.files.get(rel_path)
+            if entry is not None and entry["size"] == size and entry["mtime"] == mtime:
+                continue
+            digest = file_hash(os.path.join(root, rel_path))
+            if entry is not None and entry["sha256"] == digest:
+                entry["mtime"] = mtime
+                continue
+            changed.append(rel_path)
+        removed = sorted(set(self.files) - set(rel_paths))
+        return changed, removed
+
+    def record(self, root: str, rel_path: str):
+        size, mtime = source_stat(os.path.join(root, rel_path))
+        self.files[rel_path] = {"size": size, "mtime": mtime, "sha256": file_hash(os.path.join(root, rel_path))}
+
+    def forget(self, rel_path: str):
+        self.files.pop(rel_path, None)
@@ -1,21 +1,37 @@
-import os, owlready2
-owlready2.reasoning.JAVA_MEMORY = 1000
-from rdflib import Graph, RDF, RDFS, OWL, URIRef
-from tempfile import NamedTemporaryFile
+from collections import Counter
+from itertools import chain
+from rdflib import Graph, RDFS, OWL, URIRef
+from Assets.Hierarchy import SubclassHierarchy
+from Assets.Index import TripleIndex, AXIOM_PREDICATES, CARDINALITY_PREDICATES, EMPTY
+from Assets.Namespaces import NamespaceTrie
+from Assets.Profiling import NULL_RECORDER
 from Assets.Utils import get_local_name, is_title_case, is_lower_camel_case
 
+METRICS_VERSION = "6"
+UNATTRIBUTED = "unattributed"
+CLASSES_SUFFIX, PROPERTIES_SUFFIX = "_classes.txt", "_properties.txt"
 class Metrics:
-    def __init__(self, g: Graph, cur_filename: str = None):
+    def __init__(self, g: Graph = None, cur_filename: str = None, index: TripleIndex = None, mergeable: bool = False, recorder=NULL_RECORDER):
         self.g = g
-        self.entity = {
-            "classes": set(g.subjects(RDF.type, OWL.Class)) | set(g.subjects(RDF.type, RDFS.Class)),
-            "obj_props": set(g.subjects(RDF.type, OWL.ObjectProperty)),
-            "data_props": set(g.subjects(RDF.type, OWL.DatatypeProperty)),
-            "all_props": set(g.subjects(RDF.type, OWL.ObjectProperty)) | set(g.subjects(RDF.type, OWL.DatatypeProperty)),
-            "total_properties": len(set(g.subjects(RDF.type, OWL.ObjectProperty))) + len(set(g.subjects(RDF.type, OWL.DatatypeProperty)))
-        }
+        self.recorder = recorder
+        with recorder.stage("Metrics.__init__"):
+            self.index = index if index is not None else TripleIndex.from_graph(g, mergeable)
+            self.entity = self.index.entities()
         self.cur_fn = cur_filename
         self.metrics = {}
+        self.reuse_counts = Counter()
+        self.unsatisfiable = set()
+
+    @classmethod
+    def from_summaries(cls, summaries, cur_filename: str = None):
+        """Metrics of the union of several files, computed from their mergeable summaries without re-parsing."""
+        return cls(cur_filename=cur_filename, index=TripleIndex.merged(summaries))
+
+    def summary(self):
+        """The mergeable per-file summary; requires Metrics(..., mergeable=True)."""
+        if not self.index.mergeable:
+            raise ValueError("Metrics was not built with mergeable=True")
+        return self.index
 
     def save_classes_to_txt(self, output_path):
         with open(output_path, "w", encoding="utf-8") as f:
@@ -23,6 +39,12 @@ class Metrics:
                 if isinstance(cls, URIRef):
                     f.write(str(cls) + "\n")
 
+    def save_properties_to_txt(self, output_path):
+        with open(output_path, "w", encoding="utf-8") as f:
+            for prop in sorted(self.entity["all_props"]):
+                if isinstance(prop, URIRef):
+                    f.write(str(prop) + "\n")
+
     def structural_indicators(self):
         self.metrics["Number of Classes"] = len(self.entity["classes"])
         self.metrics["Number of Object Properties"] = len(self.entity["obj_props"])
@@ -33,8 +55,9 @@ class Metrics:
 
     def lexical_indicators(self):
         # Labeling Consistence
-        documented_classes = sum(1 for c in self.entity["classes"] if (c, RDFS.label, None) in self.g or (c, RDFS.comment, None) in self.g)
-        documented_props = sum(1 for p in self.entity["all_props"] if (p, RDFS.label, None) in self.g or (p, RDFS.comment, None) in self.g)
+        labeled, commented = self.index.labeled(), self.index.commented()
+        documented_classes = sum(1 for c in self.entity["classes"] if c in labeled or c in commented)
+        documented_props = sum(1 for p in self.entity["all_props"] if p in labeled or p in commented)
         self.metrics["Class Documentation Coverage"] = documented_classes / len(self.entity["classes"]) if self.entity["classes"] else 0
         self.metrics["Property Documentation Coverage"] = documented_props / len(self.entity["all_props"]) if self.entity["all_props"] else 0
         # Naming Convention
@@ -46,16 +69,7 @@ class Metrics:
         self.metrics["Property Naming Consistency"] = lower_camel_props / len(prop_names) if prop_names else 0
 
     def logical_indicators(self):
-        axiom_predicates = {
-            RDF.type, RDFS.subClassOf, OWL.equivalentClass, OWL.disjointWith,
-            RDFS.domain, RDFS.range, OWL.inverseOf, OWL.complementOf,
-            OWL.intersectionOf, OWL.unionOf, OWL.sameAs,
-            OWL.hasValue, OWL.allValuesFrom, OWL.someValuesFrom,
-            OWL.minCardinality, OWL.maxCardinality, OWL.cardinality,
-            OWL.minQualifiedCardinality, OWL.maxQualifiedCardinality, OWL.qualifiedCardinality
-        }
-
-        axiom_count = sum(1 for s, p, o in self.g if p in axiom_predicates)
+        axiom_count = self.index.count(*AXIOM_PREDICATES)
         self.metrics["Axiom Richness"] = (
             axiom_count / (len(self.entity["classes"]) + len(self.entity["all_props"]))
             if (len(self.entity["classes"]) + len(self.entity["all_props"])) > 0
@@ -63,58 +77,104 @@ class Metrics:
         )
 
     def usability_reusability_indicators(self, ontologies_base_urls: dict):
-        base_url = ontologies_base_urls[self.cur_fn.split(".")[0]]
+        own = self.cur_fn.split(".")[0] if self.cur_fn else None
+        known_own = own in ontologies_base_urls
+        if not known_own:
+            print(f"Warning: no base URL for {self.cur_fn}, only entities of known vocabularies count as reused")
+        trie = NamespaceTrie.for_base_urls(ontologies_base_urls)
 
         classes = self.entity["classes"]
         props = self.entity["all_props"]
 
         total_entities = len(classes) + len(props)
 
-        reused_classes = [c for c in classes if not str(c).startswith(base_url)]
-        reused_props = [p for p in props if not str(p).startswith(base_url)]
-        reused_entities = len(reused_classes) + len(reused_props)
+        self.reuse_counts = Counter()
+        for e in chain(classes, props):
+            found = trie.matches(str(e))
+            if own in found or not (found or known_own):
+                continue
+            self.reuse_counts[found[-1] if found else UNATTRIBUTED] += 1
+        reused_entities = sum(self.reuse_counts.values())
 
         self.metrics["Semantic Reuse Ratio"] = reused_entities / total_entities if total_entities else 0.0
+        self.metrics["Reused Vocabularies"] = len(set(self.reuse_counts) - {UNATTRIBUTED})
 
     def constraint_indicators(self):
-        card_preds = [
-            OWL.minCardinality, OWL.maxCardinality, OWL.cardinality,
-            OWL.minQualifiedCardinality, OWL.maxQualifiedCardinality, OWL.qualifiedCardinality
-        ]
-        self.metrics["Cardinality Restrictions"] = sum(1 for p in card_preds for _ in self.g.triples((None, p, None)))
-        self.metrics["Properties with Domain"] = len(set(self.g.subjects(RDFS.domain, None)))
-        self.metrics["Properties with Range"] = len(set(self.g.subjects(RDFS.range, None)))
-        self.metrics["Disjoint Classes"] = len(list(self.g.triples((None, OWL.disjointWith, None))))
-        self.metrics["Functional Properties"] = len(list(self.g.subjects(RDF.type, OWL.FunctionalProperty)))
-        self.metrics["Inverse Functional Properties"] = len(list(self.g.subjects(RDF.type, OWL.InverseFunctionalProperty)))
-        self.metrics["SomeValuesFrom Restrictions"] = len(list(self.g.triples((None, OWL.someValuesFrom, None))))
-        self.metrics["AllValuesFrom Restrictions"] = len(list(self.g.triples((None, OWL.allValuesFrom, None))))
+        self.metrics["Cardinality Restrictions"] = self.index.count(*CARDINALITY_PREDICATES)
+        self.metrics["Properties with Domain"] = len(self.index.subjects_with.get(RDFS.domain, EMPTY))
+        self.metrics["Properties with Range"] = len(self.index.subjects_with.get(RDFS.range, EMPTY))
+        self.metrics["Disjoint Classes"] = self.index.count(OWL.disjointWith)
+        self.metrics["Functional Properties"] = len(self.index.typed.get(OWL.FunctionalProperty, EMPTY))
+        self.metrics["Inverse Functional Properties"] = len(self.index.typed.get(OWL.InverseFunctionalProperty, EMPTY))
+        self.metrics["SomeValuesFrom Restrictions"] = self.index.count(OWL.someValuesFrom)
+        self.metrics["AllValuesFrom Restrictions"] = self.index.count(OWL.allValuesFrom)
+
+    def hierarchy_indicators(self):
+        classes = self.entity["classes"]
+        hierarchy = SubclassHierarchy(self.index.superclasses, classes)
+        heights = hierarchy.heights()
+        depths = hierarchy.depths()
+        fan_outs = [len(hierarchy.children[c]) for c in classes if c in hierarchy.children]
+        self.metrics["Subclass Relationships"] = self.index.count(RDFS.subClassOf)
+        self.metrics["Max Depth of Inheritance"] = max((heights[c] for c in classes if c in hierarchy.children), default=0)
+        self.metrics["Avg Depth of Inheritance"] = sum(depths.values()) / len(depths) if depths else 0
+        self.metrics["Max Subclass Fan-out"] = max(fan_outs, default=0)
+        self.metrics["Avg Subclass Fan-out"] = sum(fan_outs) / len(fan_outs) if fan_outs else 0
+        self.metrics["Root Classes"] = len(hierarchy.roots())
+        self.metrics["Leaf Classes"] = len(hierarchy.leaves())
+
+    def reasoning_indicators(self, step_budget: int = None):
+        from Assets.Reasoner import SaturationReasoner, REASONING_STEP_BUDGET
+        step_budget = REASONING_STEP_BUDGET if step_budget is None else step_budget
+        reasoner = SaturationReasoner(self.index).run(step_budget)
+        complete = reasoner.complete
+        if complete:
+            self.unsatisfiable = reasoner.unsatisfiable()
+        else:
+            # A partial saturation only bounds the counts from below: they are reported as unknown
+            print(f"Warning: reasoning on {self.cur_fn or 'ontology'} stopped after {step_budget} steps, its results are left empty")
+        self.metrics["Unsatisfiable Classes"] = len(self.unsatisfiable) if complete else None
+        self.metrics["Consistent"] = not reasoner.inconsistent_individuals() if complete else None
+        self.metrics["Reasoning Complete"] = complete
 
     def other_indicators(self):
-        labeled_classes = sum(1 for c in self.entity["classes"] if (c, RDFS.label, None) in self.g)
-        commented_classes = sum(1 for c in self.entity["classes"] if (c, RDFS.comment, None) in self.g)
-        labeled_props = sum(1 for p in self.entity["all_props"] if (p, RDFS.label, None) in self.g)
-        commented_props = sum(1 for p in self.entity["all_props"] if (p, RDFS.comment, None) in self.g)
-        metrics["Class Label Coverage"] = labeled_classes / len(self.entity["classes"]) if self.entity["classes"] else 0
-        metrics["Class Comment Coverage"] = commented_classes / len(self.entity["classes"]) if self.entity["classes"] else 0
-        metrics["Property Label Coverage"] = labeled_props / len(self.entity["all_props"]) if self.entity["all_props"] else 0
-        metrics["Property Comment Coverage"] = commented_props / len(self.entity["all_props"]) if self.entity["all_props"] else 0
-        self.metrics["Domain Coverage (%)"] = len(set(self.g.subjects(RDFS.domain, None))) / self.entity["total_properties"] if self.entity["total_properties"] else 0
-        self.metrics["Range Coverage (%)"] = len(set(self.g.subjects(RDFS.range, None))) / self.entity["total_properties"] if self.entity["total_properties"] else 0
+        labeled, commented = self.index.labeled(), self.index.commented()
+        labeled_classes = sum(1 for c in self.entity["classes"] if c in labeled)
+        commented_classes = sum(1 for c in self.entity["classes"] if c in commented)
+        labeled_props = sum(1 for p in self.entity["all_props"] if p in labeled)
+        commented_props = sum(1 for p in self.entity["all_props"] if p in commented)
+        self.metrics["Class Label Coverage"] = labeled_classes / len(self.entity["classes"]) if self.entity["classes"] else 0
+        self.metrics["Class Comment Coverage"] = commented_classes / len(self.entity["classes"]) if self.entity["classes"] else 0
+        self.metrics["Property Label Coverage"] = labeled_props / len(self.entity["all_props"]) if self.entity["all_props"] else 0
+        self.metrics["Property Comment Coverage"] = commented_props / len(self.entity["all_props"]) if self.entity["all_props"] else 0
+        self.metrics["Domain Coverage (%)"] = len(self.index.subjects_with.get(RDFS.domain, EMPTY)) / self.entity["total_properties"] if self.entity["total_properties"] else 0
+        self.metrics["Range Coverage (%)"] = len(self.index.subjects_with.get(RDFS.range, EMPTY)) / self.entity["total_properties"] if self.entity["total_properties"] else 0
 
     def run(self,
             structural_metrics: bool = True,
             lexical_metrics: bool = True,
             logical_indicators: bool = True,
             constraint_indicators: bool = True,
+            hierarchy_indicators: bool = True,
+            reasoning_indicators: bool = True,
+            reasoning_step_budget: int = None,
             add_other_indicators: bool = False,
             ontology_c_output: str = None,
             ontologies_base_urls: dict = None):
-        if structural_metrics: self.structural_indicators()
-        if lexical_metrics: self.lexical_indicators()
-        if logical_indicators: self.logical_indicators()
-        if constraint_indicators: self.constraint_indicators()
-        if add_other_indicators: self.other_indicators()
-        if ontology_c_output is not None: self.save_classes_to_txt(ontology_c_output)
-        if ontologies_base_urls is not None: self.usability_reusability_indicators(ontologies_base_urls)
-        return self.metrics
\ No newline at end of file
+        if structural_metrics: self._timed(self.structural_indicators)
+        if lexical_metrics: self._timed(self.lexical_indicators)
+        if logical_indicators: self._timed(self.logical_indicators)
+        if constraint_indicators: self._timed(self.constraint_indicators)
+        if hierarchy_indicators: self._timed(self.hierarchy_indicators)
+        if reasoning_indicators: self._timed(self.reasoning_indicators, reasoning_step_budget)
+        if add_other_indicators: self._timed(self.other_indicators)
+        if ontology_c_output is not None:
+            self._timed(self.save_classes_to_txt, ontology_c_output)
+            if ontology_c_output.endswith(CLASSES_SUFFIX):
+                self._timed(self.save_properties_to_txt, ontology_c_output[:-len(CLASSES_SUFFIX)] + PROPERTIES_SUFFIX)
+        if ontologies_base_urls is not None: self._timed(self.usability_reusability_indicators, ontologies_base_urls)
+        return self.metrics
+
+    def _timed(self, indicator, *args):
+        with self.recorder.stage(indicator.__name__):
+            indicator(*args)
\ No newline at end of file
@@ -0,0 +1,73 @@
+WELL_KNOWN_VOCABULARIES = {
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+    "owl": "http://www.w3.org/2002/07/owl#",
+    "xsd": "http://www.w3.org/2001/XMLSchema#",
+    "skos": "http://www.w3.org/2004/02/skos/core#",
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "dcterms": "http://purl.org/dc/terms/",
+    "foaf": "http://xmlns.com/foaf/0.1/",
+    "time": "http://www.w3.org/2006/time#",
+    "prov": "http://www.w3.org/ns/prov#",
+    "sosa": "http://www.w3.org/ns/sosa/",
+    "ssn": "http://www.w3.org/ns/ssn/",
+    "geo": "http://www.w3.org/2003/01/geo/wgs84_pos#",
+    "vann": "http://purl.org/vocab/vann/",
+    "schema": "http://schema.org/",
+    "gr": "http://purl.org/goodrelations/v1#",
+    "qudt": "http://qudt.org/schema/qudt/",
+    "om": "http://www.ontology-of-units-of-measure.org/resource/om-2/",
+    "saref": "https://saref.etsi.org/core/",
+    "obo": "http://purl.obolibrary.org/obo/",
+    "bfo": "http://purl.obolibrary.org/obo/BFO_",
+    "iao": "http://purl.obolibrary.org/obo/IAO_",
+    "ro": "http://purl.obolibrary.org/obo/RO_"
+}
+
+class NamespaceTrie:
+    """Character trie over namespace IRIs; one walk along an IRI finds every namespace that is a prefix of it."""
+    END = ""
+
+    def __init__(self, namespaces: dict = None):
+        self.root = {}
+        for name, base_url in (namespaces or {}).items():
+            self.add(name, base_url)
+
+    @classmethod
+    def for_base_urls(cls, ontologies_base_urls: dict, well_known: bool = True):
+        """Trie over the evaluated ontologies' base URLs plus, optionally, the well-known vocabularies (evaluated ones win on a tie)."""
+        key = (tuple(sorted(ontologies_base_urls.items())), well_known)
+        trie = _TRIES.get(key)
+        if trie is None:
+            trie = cls(WELL_KNOWN_VOCABULARIES if well_known else None)
+            for name, base_url in ontologies_base_urls.items():
+                trie.add(name, base_url)
+            _TRIES[key] = trie
+        return trie
+
+    def add(self, name, base_url):
+        node = self.root
+        for ch in base_url:
+            node = node.setdefault(ch, {})
+        node.setdefault(self.END, []).append(name)
+
+    def matches(self, iri):
+        """Names of all namespaces that prefix iri, shortest first."""
+        found = []
+        node = self.root
+        for ch in iri:
+            if self.END in node:
+                found.extend(node[self.END])
+            node = node.get(ch)
+            if node is None:
+                return found
+        if self.END in node:
+            found.extend(node[self.END])
+        return found
+
+    def attribute(self, iri):
+        """Name of the longest namespace prefixing iri, or None."""
+        found = self.matches(iri)
+        return found[-1] if found else None
+
+_TRIES = {}
@@ -0,0 +1,199 @@
+"""Pairwise shared-class and shared-property overlap between the works exported by save_classes_to_txt/save_properties_to_txt.
+
+    python main.py overlap --classes-dir OntologyClasses --out-dir MetricsResults
+
+Entities are compared as 64-bit hashes of their IRIs. Small corpora are intersected exactly; above EXACT_MAX_ENTITIES
+Jaccard and shared counts are estimated from MinHash signatures, compared for every pair up to ALL_PAIRS_MAX pairs
+and for the candidate pairs of LSH banding beyond that.
+"""
+import os
+from collections import Counter, defaultdict
+import numpy as np
+import pandas as pd
+from Assets.Metrics import CLASSES_SUFFIX, PROPERTIES_SUFFIX
+
+KINDS = {"classes": CLASSES_SUFFIX, "properties": PROPERTIES_SUFFIX}
+# The exact intersection sorts every hash with its owner (about 24 bytes per entity); MinHash keeps 1 KiB per work
+EXACT_MAX_ENTITIES = 20_000_000
+MINHASH_PERMUTATIONS = 128
+# 64 bands of 2 rows: pairs with a Jaccard of 0.125 or more are candidates with probability 63% or more
+LSH_BANDS = 64
+ALL_PAIRS_MAX = 500_000
+PAIR_COLUMNS = ["Ontology A", "Ontology B", "Shared", "Jaccard", "Containment A in B", "Containment B in A"]
+
+_FNV_OFFSET, _FNV_PRIME = np.uint64(0xcbf29ce484222325), np.uint64(0x100000001b3)
+
+def line_hashes(data: bytes):
+    """64-bit FNV-1a hashes, finished with the splitmix64 mixer, of the non-empty lines of data.
+
+    Lines are sorted by length so that each byte column is hashed for one contiguous slice of the still unfinished lines.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(buf == ord("\n"))
+    if len(buf) and buf[-1] != ord("\n"):
+        ends = np.append(ends, len(buf))
+    starts = np.r_[0, ends[:-1] + 1].astype(np.int64)
+    lengths = ends - starts
+    lengths -= (lengths > 0) & (buf[np.maximum(ends - 1, 0)] == ord("\r"))
+    order = np.argsort(-lengths, kind="stable")
+    starts, lengths = starts[order], lengths[order]
+    lengths = lengths[:np.count_nonzero(lengths)]
+    h = np.full(len(lengths), _FNV_OFFSET, dtype=np.uint64)
+    active = np.searchsorted(-lengths, -np.arange(int(lengths.max(initial=0))), side="left")
+    for k, m in enumerate(active.tolist()):
+        h[:m] ^= buf[starts[:m] + k]
+        h[:m] *= _FNV_PRIME
+    h ^= h >> np.uint64(30)
+    h *= np.uint64(0xbf58476d1ce4e5b9)
+    h ^= h >> np.uint64(27)
+    h *= np.uint64(0x94d049bb133111eb)
+    h ^= h >> np.uint64(31)
+    return h
+
+def load_entity_sets(directory, suffix):
+    """{work: sorted unique uint64 IRI hashes} for every <work><suffix> file in directory."""
+    sets = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(suffix):
+            with open(os.path.join(directory, name), "rb") as f:
+                sets[name[:-len(suffix)]] = np.unique(line_hashes(f.read()))
+    return sets
+
+def exact_intersections(sets):
+    """n x n matrix of shared entity counts (set sizes on the diagonal) from one sort of all hashes.
+
+    Only hashes owned by several sets are visited, grouped by the exact set of owners, so the cost follows the
+    number of distinct sharing patterns rather than the number of pairs.
+    """
+    n = len(sets)
+    sizes = np.array([len(s) for s in sets], dtype=np.int64)
+    counts = np.zeros((n, n), dtype=np.int64)
+    if sizes.sum():
+        hashes = np.concatenate(sets)
+        owners = np.repeat(np.arange(n), sizes)
+        order = np.argsort(hashes, kind="stable")
+        hashes, owners = hashes[order], owners[order]
+        starts = np.flatnonzero(np.r_[True, hashes[1:] != hashes[:-1]])
+        lengths = np.diff(np.r_[starts, len(hashes)])
+        owners = owners.tolist()
+        patterns = Counter(tuple(owners[start:start + length]) for start, length in zip(starts[lengths > 1].tolist(), lengths[lengths > 1].tolist()))
+        for members, count in patterns.items():
+            members = np.array(members)
+            counts[np.ix_(members, members)] += count
+    np.fill_diagonal(counts, sizes)
+    return counts
+
+def minhash_signatures(sets, permutations: int = MINHASH_PERMUTATIONS, seed: int = 0, block: int = 1 << 14):
+    """(n, permutations) MinHash signatures; each permutation is x -> a * x + b mod 2^64 (a odd) followed by an xor-shift."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 1 << 63, permutations, dtype=np.uint64) << np.uint64(1) | np.uint64(1)
+    b = rng.integers(0, 1 << 63, permutations, dtype=np.uint64)
+    signatures = np.full((len(sets), permutations), np.iinfo(np.uint64).max, dtype=np.uint64)
+    for i, hashes in enumerate(sets):
+        for start in range(0, len(hashes), block):
+            h = hashes[start:start + block, None] * a + b
+            h ^= h >> np.uint64(29)
+            np.minimum(signatures[i], h.min(axis=0), out=signatures[i])
+    return signatures
+
+def lsh_candidates(signatures, bands: int = LSH_BANDS, exclude=()):
+    """Pairs (i < j) whose signatures agree on every row of at least one band."""
+    rows = signatures.shape[1] // bands
+    pairs = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        for i, key in enumerate(signatures[:, band * rows:(band + 1) * rows]):
+            if i not in exclude:
+                buckets[key.tobytes()].append(i)
+        for members in buckets.values():
+            pairs.update((a, b) for k, a in enumerate(members) for b in members[k + 1:])
+    return sorted(pairs)
+
+def signature_pairs(signatures, exclude=()):
+    """Every pair (i < j) of non-excluded signatures, or the LSH candidates once there are more than ALL_PAIRS_MAX."""
+    keep = [k for k in range(len(signatures)) if k not in exclude]
+    if len(keep) * (len(keep) - 1) // 2 > ALL_PAIRS_MAX:
+        return lsh_candidates(signatures, exclude=exclude)
+    return [(a, b) for k, a in enumerate(keep) for b in keep[k + 1:]]
+
+def overlap_pairs(sets: dict, method: str = "auto"):
+    """Overlapping pairs of works as a frame of PAIR_COLUMNS, plus the square Jaccard matrix, and the method used."""
+    names, arrays = list(sets), list(sets.values())
+    sizes = np.array([len(s) for s in arrays], dtype=np.int64)
+    if method == "auto":
+        method = "exact" if sizes.sum() <= EXACT_MAX_ENTITIES else "minhash"
+    if method == "exact":
+        shared = exact_intersections(arrays)
+        i, j = np.nonzero(np.triu(shared, 1))
+        shared = shared[i, j].astype(float)
+        jaccard = shared / (sizes[i] + sizes[j] - shared)
+    elif method == "minhash":
+        signatures = minhash_signatures(arrays)
+        candidates = np.array(signature_pairs(signatures, exclude={k for k, size in enumerate(sizes) if not size}), dtype=np.int64).reshape(-1, 2)
+        i, j = candidates[:, 0], candidates[:, 1]
+        jaccard = (signatures[i] == signatures[j]).mean(axis=1)
+        keep = jaccard > 0
+        i, j, jaccard = i[keep], j[keep], jaccard[keep]
+        shared = np.minimum(np.rint(jaccard / (1 + jaccard) * (sizes[i] + sizes[j])), np.minimum(sizes[i], sizes[j]))
+    else:
+        raise ValueError(f"Unknown overlap method: {method}")
+    pairs = pd.DataFrame({
+        "Ontology A": [names[k] for k in i], "Ontology B": [names[k] for k in j], "Shared": shared.astype(int),
+        "Jaccard": jaccard, "Containment A in B": shared / sizes[i], "Containment B in A": shared / sizes[j]
+    }, columns=PAIR_COLUMNS)
+    matrix = np.eye(len(names)) * (sizes > 0)
+    matrix[i, j] = matrix[j, i] = jaccard
+    return pairs.sort_values(["Jaccard", "Ontology A", "Ontology B"], ascending=[False, True, True], ignore_index=True), pd.DataFrame(matrix, index=names, columns=names), method
+
+def clusters(pairs, names, threshold: float = 0.5, measure: str = "containment"):
+    """Single-linkage clusters: works joined by a pair whose Jaccard, or larger containment, reaches threshold."""
+    parent = {name: name for name in names}
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+    score = pairs["Jaccard"] if measure == "jaccard" else pairs[["Containment A in B", "Containment B in A"]].max(axis=1)
+    for a, b in zip(pairs["Ontology A"][score >= threshold], pairs["Ontology B"][score >= threshold]):
+        parent[find(a)] = find(b)
+    members = defaultdict(list)
+    for name in names:
+        members[find(name)].append(name)
+    rows = []
+    for cluster, group in enumerate(sorted(members.values(), key=lambda group: (-len(group), group[0])), start=1):
+        rows += [{"Ontology": name, "Cluster": cluster, "Cluster Size": len(group)} for name in group]
+    return pd.DataFrame(rows, columns=["Ontology", "Cluster", "Cluster Size"])
+
+class OverlapAnalysis:
+    """Overlap of classes and properties between every pair of works exported to classes_dir."""
+    def __init__(self, classes_dir: str = "OntologyClasses", method: str = "auto"):
+        self.classes_dir = classes_dir
+        self.method = method
+        self.pairs, self.matrices, self.methods = {}, {}, {}
+        self.clusters = None
+
+    def run(self, threshold: float = 0.5, measure: str = "containment"):
+        """Computes the pairs and Jaccard matrix per kind, then clusters the works on their shared classes."""
+        for kind, suffix in KINDS.items():
+            sets = load_entity_sets(self.classes_dir, suffix)
+            if not sets:
+                print(f"Warning: no *{suffix} files in {self.classes_dir}, {kind} overlap skipped")
+                continue
+            self.pairs[kind], self.matrices[kind], self.methods[kind] = overlap_pairs(sets, self.method)
+            print(f"{kind.capitalize()} overlap: {len(sets)} works, {len(self.pairs[kind])} overlapping pairs ({self.methods[kind]})")
+        if "classes" in self.pairs:
+            self.clusters = clusters(self.pairs["classes"], list(self.matrices["classes"].index), threshold, measure)
+        return self
+
+    def save(self, output_dir: str):
+        os.makedirs(output_dir, exist_ok=True)
+        for kind in self.pairs:
+            pairs_csv = os.path.join(output_dir, f"Ontology {kind.capitalize()} Overlap.csv")
+            matrix_csv = os.path.join(output_dir, f"Ontology {kind.capitalize()} Jaccard Matrix.csv")
+            self.pairs[kind].assign(Method=self.methods[kind]).to_csv(pairs_csv, sep=";", index=False)
+            self.matrices[kind].to_csv(matrix_csv, sep=";", index_label="Ontology Source")
+            print(f"\n✅ {kind.capitalize()} overlap saved to: {pairs_csv} and {matrix_csv}")
+        if self.clusters is not None:
+            clusters_csv = os.path.join(output_dir, "Ontology Clusters.csv")
+            self.clusters.to_csv(clusters_csv, sep=";", index=False)
+            print(f"\n✅ Clusters saved to: {clusters_csv}")
@@ -0,0 +1,152 @@
+import io, os, pathlib, re, uuid
+from concurrent.futures import ProcessPoolExecutor
+from rdflib import Graph, Literal
+from rdflib.plugins.parsers.nquads import NQuadsParser
+from rdflib.plugins.parsers.ntriples import W3CNTriplesParser
+from rdflib.util import guess_format
+from Assets.Archives import open_source
+from Assets.Index import TripleIndex
+
+LINE_FORMATS = {"nt", "nquads"}
+SNIFF_BYTES = 1 << 16
+# Line-based files at least this large are split into CHUNK_BYTES byte ranges parsed in parallel
+PARALLEL_MIN_BYTES = 32 << 20
+CHUNK_BYTES = 16 << 20
+# Subject/object terms _index_range interns at most, so that its table stays bounded on large dumps
+INTERN_MAX = 1 << 16
+
+_IRI = r"<[^<>\"{}|^`\\\s]*>"
+_BNODE = r"_:[\w.-]*[\w-]"
+_LITERAL = rf'"(?:[^"\\\n]|\\.)*"(?:@[A-Za-z]+(?:-[A-Za-z0-9]+)*|\^\^{_IRI})?'
+_STATEMENT = re.compile(rf"\s*(?:{_IRI}|{_BNODE})\s*{_IRI}\s*(?:{_IRI}|{_BNODE}|{_LITERAL})\s*({_IRI}|{_BNODE})?\s*\.\s*(?:#.*)?")
+_XML_START = re.compile(r"<(?:\?xml|!DOCTYPE|!--|[A-Za-z_][\w.-]*(?:[\s/>]|$))")
+# <p:name> is an XML element only where the sample declares xmlns:p, otherwise it reads as a Turtle IRI like <urn:x>
+_XML_PREFIXED = re.compile(r"<([A-Za-z_][\w.-]*):[A-Za-z_][\w.-]*(?:[\s/>]|$)")
+_TURTLE_DIRECTIVE = re.compile(r"^\s*(?:@prefix|@base|PREFIX\s|BASE\s)", re.M | re.I)
+
+def sniff_format(file_path, sample_bytes: int = SNIFF_BYTES):
+    """rdflib format name of file_path judged from its first bytes, or None to let rdflib guess from the extension."""
+    with open_source(file_path) as f:
+        sample = f.read(sample_bytes)
+    lines = sample.decode("utf-8", errors="ignore").lstrip("\ufeff").splitlines()
+    if len(sample) == sample_bytes and len(lines) > 1:
+        lines.pop()
+    statements = [line for line in lines if line.strip() and not line.lstrip().startswith("#")]
+    if not statements:
+        return None
+    matches = [_STATEMENT.fullmatch(line) for line in statements]
+    if all(matches):
+        return "nquads" if any(m.group(1) for m in matches) else "nt"
+    text, first = "\n".join(lines), statements[0].lstrip()
+    prefixed = _XML_PREFIXED.match(first)
+    if _XML_START.match(first) or (prefixed and f"xmlns:{prefixed.group(1)}=" in text):
+        return "xml"
+    if first.startswith("{") or re.match(r"\[\s*[{\]]", first):
+        return "json-ld"
+    if _TURTLE_DIRECTIVE.search(text) or first.startswith(("<", "_:")):
+        return "turtle"
+    return None
+
+class _LineSink:
+    """Sink of the N-Triples/N-Quads line parsers that hands each triple to add(s, p, o); graph names are dropped."""
+    def __init__(self, add):
+        self.add_triple = add
+        self.default_context = self
+
+    def triple(self, s, p, o):
+        self.add_triple(s, p, o)
+
+    def add(self, triple):
+        self.add_triple(*triple)
+
+    def get_context(self, _):
+        return self
+
+class _FileBNodes(dict):
+    """Blank node context giving a label the same BNode in every chunk of a file, and distinct from other files."""
+    def __init__(self, prefix: str):
+        super().__init__()
+        self.prefix = prefix
+
+    def get(self, label, default=None):
+        return self.prefix + label
+
+def parse_lines(file_path, fmt, add, start: int = 0, end: int = None, bnode_prefix: str = None):
+    """Feeds the triples of an N-Triples/N-Quads file, or of its byte range [start, end), to add(s, p, o)."""
+    parser = (NQuadsParser if fmt == "nquads" else W3CNTriplesParser)(_LineSink(add))
+    bnodes = _FileBNodes(bnode_prefix or uuid.uuid4().hex)
+    if end is None and not start:
+        with io.TextIOWrapper(open_source(file_path), encoding="utf-8") as f:
+            W3CNTriplesParser.parse(parser, f, bnode_context=bnodes)
+        return
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start if end is not None else -1)
+    W3CNTriplesParser.parse(parser, io.StringIO(data.decode("utf-8")), bnode_context=bnodes)
+
+def line_chunks(file_path, chunk_bytes: int = CHUNK_BYTES):
+    """Byte ranges of about chunk_bytes covering file_path, each ending at a line boundary."""
+    size = os.path.getsize(file_path)
+    ranges, start = [], 0
+    with open(file_path, "rb") as f:
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+def _index_range(index: TripleIndex, file_path, fmt, start=0, end=None, bnode_prefix=None):
+    """Indexes the triples with their terms interned: the parser makes a new object per occurrence, and shared ones
+    make the index smaller and several times faster to pickle back from a worker.
+
+    Predicates are all interned; IRIs and blank nodes through a table cleared every INTERN_MAX terms, as a dump
+    mostly repeats a term close to where it was last seen. Literals, which the index never keeps, are not interned.
+    """
+    predicates, terms = {}, {}
+
+    def intern(term):
+        if isinstance(term, Literal):
+            return term
+        if len(terms) >= INTERN_MAX:
+            terms.clear()
+        return terms.setdefault(term, term)
+
+    def add(s, p, o):
+        index.add(intern(s), predicates.setdefault(p, p), intern(o))
+
+    parse_lines(file_path, fmt, add, start, end, bnode_prefix)
+    return index
+
+def _index_chunk(file_path, fmt, start, end, bnode_prefix, axioms):
+    return _index_range(TripleIndex(True, axioms), file_path, fmt, start, end, bnode_prefix)
+
+def chunked(file_path, fmt=None):
+    """Whether file_path is a line-based dump large enough for index_lines to split it across processes (archive members never are)."""
+    return os.path.isfile(file_path) and os.path.getsize(file_path) >= PARALLEL_MIN_BYTES and (fmt or sniff_format(file_path)) in LINE_FORMATS
+
+def index_lines(file_path, fmt, mergeable: bool = False, jobs: int = None, axioms: bool = True):
+    """TripleIndex of an N-Triples/N-Quads file. Large files are cut into line-aligned chunks indexed by jobs
+    worker processes; the per-chunk indexes are merged, so the result is mergeable whatever mergeable says."""
+    jobs = jobs or os.cpu_count() or 1
+    ranges = line_chunks(file_path) if jobs > 1 and chunked(file_path, fmt) else []
+    if len(ranges) < 2:
+        return _index_range(TripleIndex(mergeable, axioms), file_path, fmt)
+    prefix = uuid.uuid4().hex
+    with ProcessPoolExecutor(max_workers=min(jobs, len(ranges))) as executor:
+        parts = executor.map(_index_chunk, *zip(*((file_path, fmt, start, end, prefix, axioms) for start, end in ranges)))
+        return TripleIndex.merged(parts)
+
+def parse_file(g: Graph, file_path):
+    """Parses file_path, a file or an archive member, into g with the format sniffed from its content;
+    N-Quads graph names are merged into g."""
+    fmt = sniff_format(file_path)
+    if fmt == "nquads":
+        parse_lines(file_path, fmt, lambda s, p, o: g.add((s, p, o)))
+    elif os.path.isfile(file_path):
+        g.parse(file_path, format=fmt)
+    else:
+        with open_source(file_path) as f:
+            g.parse(source=f, format=fmt or guess_format(file_path), publicID=pathlib.Path(os.path.abspath(file_path)).as_uri())
+    return g
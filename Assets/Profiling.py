@@ -0,0 +1,123 @@
+import cProfile, os, re, time
+from contextlib import contextmanager, nullcontext
+
+PROFILE_RECORDS = "Profile Records"
+
+def peak_rss_mb():
+    """High-water resident set size of this process in MB since the last reset_peak_rss, or None off Linux."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+def reset_peak_rss():
+    """Lowers the high-water mark of peak_rss_mb to the current RSS; False where the kernel does not allow it."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+class StageRecorder:
+    """Wall time, CPU time, triple count and peak RSS of each stage of one ontology's evaluation.
+
+    The process-wide high-water mark only rises, so it is reset when a stage starts and every stage reports the peak
+    reached while it ran; an enclosing stage gets the highest of its own and its inner stages' peaks. Where the mark
+    cannot be reset (outside Linux) the peak is left empty rather than reporting the whole process.
+    """
+    def __init__(self, source: str, cprofile_path: str = None):
+        self.source = source
+        self.cprofile_path = cprofile_path
+        self.triples = None
+        self.records = []
+        self.peaks = []
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.peaks and self.peaks[-1] is not None:
+            self.peaks[-1] = max(self.peaks[-1], peak_rss_mb() or 0)
+        self.peaks.append(0 if reset_peak_rss() else None)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            peak = self.peaks.pop()
+            if peak is not None:
+                peak = max(peak, peak_rss_mb() or 0)
+                if self.peaks and self.peaks[-1] is not None:
+                    self.peaks[-1] = max(self.peaks[-1], peak)
+            self.records.append({
+                "source": self.source, "stage": name, "pid": os.getpid(),
+                "wall_s": time.perf_counter() - wall, "cpu_s": time.process_time() - cpu,
+                "triples": self.triples, "peak_rss_mb": peak
+            })
+
+    @contextmanager
+    def task(self):
+        """Wraps a whole ontology; runs it under cProfile when this source was selected for it."""
+        profile = cProfile.Profile() if self.cprofile_path else None
+        with self.stage("total"):
+            if profile is not None:
+                profile.enable()
+            try:
+                yield self
+            finally:
+                if profile is not None:
+                    profile.disable()
+                    profile.dump_stats(self.cprofile_path)
+
+    def columns(self):
+        total = next((r for r in reversed(self.records) if r["stage"] == "total"), None)
+        if total is None:
+            return {}
+        return {"Wall Time (s)": total["wall_s"], "CPU Time (s)": total["cpu_s"], "Triples": self.triples, "Peak RSS (MB)": total["peak_rss_mb"]}
+
+class _NullRecorder:
+    records = ()
+    _null = nullcontext()
+
+    @property
+    def triples(self):
+        return None
+
+    @triples.setter
+    def triples(self, value):
+        pass
+
+    def stage(self, name: str):
+        return self._null
+
+    def task(self):
+        return nullcontext(self)
+
+    def columns(self):
+        return {}
+
+NULL_RECORDER = _NullRecorder()
+
+class Profiler:
+    """Instrumentation settings for OntologyEvaluator, small enough to ship to worker processes.
+
+    enabled adds Wall Time/CPU Time/Triples/Peak RSS columns to each row and, with trace_path, appends one
+    JSONL record per stage. Sources listed in cprofile (file paths relative to root, or work names) are also
+    run under cProfile, with stats written to cprofile_dir/<source>.prof.
+    """
+    def __init__(self, enabled: bool = True, trace_path: str = None, cprofile=(), cprofile_dir: str = "."):
+        self.enabled = enabled
+        self.trace_path = trace_path
+        self.cprofile = set(cprofile)
+        self.cprofile_dir = cprofile_dir
+
+    def recorder(self, source: str):
+        if not self.enabled and source not in self.cprofile:
+            return NULL_RECORDER
+        cprofile_path = None
+        if source in self.cprofile:
+            os.makedirs(self.cprofile_dir, exist_ok=True)
+            cprofile_path = os.path.join(self.cprofile_dir, re.sub(r"[^\w.-]+", "_", source) + ".prof")
+        return StageRecorder(source, cprofile_path)
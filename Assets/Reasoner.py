@@ -0,0 +1,291 @@
+from collections import defaultdict, deque
+from rdflib import BNode, URIRef, Literal, RDF, RDFS, OWL
+from Assets.Index import TripleIndex, EMPTY
+
+# Context saturations before run gives up: a count rather than seconds, so that a row does not depend on the
+# machine or its load (the works of the corpus need at most ~15,000); a wall-clock cap is --time-limit's job
+REASONING_STEP_BUDGET = 200_000
+THING, NOTHING = OWL.Thing, OWL.Nothing
+_BOTTOM = frozenset([NOTHING])
+
+class SaturationReasoner:
+    """Rule-based coherence and consistency checker over the class axioms of a TripleIndex.
+
+    Class expressions are normalized to atoms: named classes, ("and", members), ("or", members),
+    ("not", c), ("some", p, c), ("all", p, c), ("min", p, c, n), ("max", p, c, n) and ("value", a)
+    for an individual. Every context (a set of atoms that must hold together: a named class, an
+    individual, or the filler of an existential) is saturated EL/RL-style: told subsumptions,
+    conjunction in both directions, existentials with domains, ranges, sub-properties and
+    allValuesFrom carried into their filler, and existentials on the left of an axiom. A context
+    reaching owl:Nothing is unsatisfiable; the clashes are owl:disjointWith/AllDisjointClasses/
+    disjointUnionOf, complements, an unsatisfiable filler and min/max cardinalities (functional
+    properties included) that cannot both hold. The rules are sound but incomplete, so a class
+    reported unsatisfiable is, while a missing report only means no clash was derived.
+    """
+    def __init__(self, index: TripleIndex):
+        self.classes = {c for c in index.entities()["classes"] if isinstance(c, URIRef)}
+        self.functional = index.typed.get(OWL.FunctionalProperty, EMPTY)
+        self.objects = defaultdict(lambda: defaultdict(list))
+        for s, p, o in index.axioms:
+            self.objects[s][p].append(o)
+        self.told = defaultdict(set)
+        self.disjoint = defaultdict(set)
+        self.lhs_conjunctions = defaultdict(list)
+        self.lhs_existentials = defaultdict(list)
+        self.domains = defaultdict(set)
+        self.ranges = defaultdict(set)
+        self.super_properties = defaultdict(set)
+        self.individuals = set()
+        self._expressions = {}
+        self._property_closures = {}
+        self._load(index.axioms)
+        self.saturated = {}
+        self.watchers = defaultdict(set)
+        self.pending = deque()
+        self.queued = set()
+        self.complete = True
+
+    def _list(self, node):
+        items, seen = [], set()
+        while node != RDF.nil and node not in seen and node in self.objects:
+            seen.add(node)
+            first, rest = self.objects[node].get(RDF.first), self.objects[node].get(RDF.rest)
+            if not first or not rest:
+                break
+            items.append(first[0])
+            node = rest[0]
+        return items
+
+    def expression(self, node):
+        """The atom for a class expression node; unknown blank nodes stay opaque atoms."""
+        if isinstance(node, Literal):
+            return None
+        if not isinstance(node, BNode):
+            return node
+        if node in self._expressions:
+            return self._expressions[node]
+        self._expressions[node] = node
+        props = self.objects.get(node, {})
+        atom = node
+        if OWL.intersectionOf in props:
+            atom = ("and", frozenset(filter(None, map(self.expression, self._list(props[OWL.intersectionOf][0])))))
+        elif OWL.unionOf in props:
+            atom = ("or", frozenset(filter(None, map(self.expression, self._list(props[OWL.unionOf][0])))))
+        elif OWL.oneOf in props:
+            atom = ("or", frozenset(("value", a) for a in self._list(props[OWL.oneOf][0])))
+        elif OWL.complementOf in props:
+            atom = ("not", self.expression(props[OWL.complementOf][0]))
+        elif OWL.onProperty in props:
+            atom = self._restriction(props[OWL.onProperty][0], props)
+        self._expressions[node] = atom
+        return atom
+
+    def _restriction(self, prop, props):
+        filler = self.expression(props[OWL.onClass][0]) if OWL.onClass in props else THING
+        if OWL.someValuesFrom in props:
+            return ("some", prop, self.expression(props[OWL.someValuesFrom][0]) or THING)
+        if OWL.allValuesFrom in props:
+            return ("all", prop, self.expression(props[OWL.allValuesFrom][0]) or THING)
+        if OWL.hasValue in props:
+            return ("some", prop, ("value", props[OWL.hasValue][0]))
+        atoms = []
+        for predicate, bounds in (
+                (OWL.minCardinality, "min"), (OWL.minQualifiedCardinality, "min"),
+                (OWL.maxCardinality, "max"), (OWL.maxQualifiedCardinality, "max"),
+                (OWL.cardinality, "exact"), (OWL.qualifiedCardinality, "exact")):
+            if predicate not in props:
+                continue
+            try:
+                n = int(props[predicate][0])
+            except (TypeError, ValueError):
+                continue
+            if bounds in ("min", "exact") and n > 0:
+                atoms += [("some", prop, filler), ("min", prop, filler, n)]
+            if bounds in ("max", "exact"):
+                atoms.append(("max", prop, filler, n))
+        if not atoms:
+            return None
+        return atoms[0] if len(atoms) == 1 else ("and", frozenset(atoms))
+
+    def _load(self, axioms):
+        for s, p, o in axioms:
+            if p == RDFS.subClassOf:
+                self._subsumes(s, o)
+            elif p == OWL.equivalentClass:
+                self._subsumes(s, o)
+                self._subsumes(o, s)
+            elif p == OWL.disjointWith:
+                self._disjoint([s, o])
+            elif p == OWL.members and (s, RDF.type, OWL.AllDisjointClasses) in axioms:
+                self._disjoint(self._list(o))
+            elif p == OWL.disjointUnionOf:
+                members = self._list(o)
+                self._disjoint(members)
+                for member in members:
+                    self._subsumes(member, s)
+            elif p == OWL.complementOf and isinstance(s, URIRef):
+                self._subsumes(s, o, negated=True)
+            elif p == RDFS.domain:
+                self.domains[s].add(self.expression(o))
+            elif p == RDFS.range:
+                self.ranges[s].add(self.expression(o))
+            elif p == RDFS.subPropertyOf:
+                self.super_properties[s].add(o)
+            elif p == RDF.type and o not in (OWL.AllDisjointClasses,):
+                self.individuals.add(s)
+                self.told[("value", s)].add(self.expression(o))
+        for s, p, o in axioms:
+            if p == OWL.inverseOf:
+                for a, b in ((s, o), (o, s)):
+                    self.domains[a] |= self.ranges[b]
+                    self.ranges[a] |= self.domains[b]
+        for atoms in (self.domains, self.ranges):
+            for key in atoms:
+                atoms[key].discard(None)
+
+    def _subsumes(self, sub, sup, negated=False):
+        sub, sup = self.expression(sub), self.expression(sup)
+        if sub is None or sup is None:
+            return
+        if negated:
+            sup = ("not", sup)
+        self.told[sub].add(sup)
+        if isinstance(sub, tuple):
+            if sub[0] == "and" and sub[1]:
+                self.lhs_conjunctions[next(iter(sub[1]))].append(sub)
+            elif sub[0] == "some":
+                self.lhs_existentials[sub[1]].append(sub)
+            elif sub[0] == "or":
+                for member in sub[1]:
+                    self.told[member].add(sup)
+
+    def _disjoint(self, members):
+        atoms = [a for a in map(self.expression, members) if a is not None]
+        for i, a in enumerate(atoms):
+            for b in atoms[i + 1:]:
+                self.disjoint[a].add(b)
+                self.disjoint[b].add(a)
+
+    def _above(self, prop):
+        """(domains, ranges, functional) inherited by prop from itself and its super-properties."""
+        above = self._property_closures.get(prop)
+        if above is None:
+            props, stack = {prop}, [prop]
+            while stack:
+                for parent in self.super_properties.get(stack.pop(), ()):
+                    if parent not in props:
+                        props.add(parent)
+                        stack.append(parent)
+            domains = frozenset().union(*(self.domains.get(p, ()) for p in props))
+            ranges = frozenset().union(*(self.ranges.get(p, ()) for p in props))
+            above = self._property_closures[prop] = (props, domains, ranges, bool(props & self.functional))
+        return above
+
+    def _context(self, atoms):
+        """Saturation state of the context atoms, created and scheduled on first use."""
+        state = self.saturated.get(atoms)
+        if state is None:
+            state = self.saturated[atoms] = _Context(atoms)
+            self._schedule(atoms)
+        return state
+
+    def _schedule(self, context):
+        if context not in self.queued:
+            self.queued.add(context)
+            self.pending.append(context)
+
+    def _saturate(self, context):
+        """Continues saturating context from where its last pass stopped; True if it derived anything new."""
+        state = self.saturated[context]
+        if state.unsatisfiable:
+            return False
+        size = len(state.atoms)
+        atoms, queue = state.atoms, state.queue
+        while True:
+            while queue:
+                atom = queue.popleft()
+                if atom in atoms:
+                    continue
+                atoms.add(atom)
+                if atom in _BOTTOM or ("not", atom) in atoms or (atom in self.disjoint and not self.disjoint[atom].isdisjoint(atoms)):
+                    return state.clash()
+                queue.extend(self.told.get(atom, ()))
+                state.conjunctions.extend(self.lhs_conjunctions.get(atom, ()))
+                if isinstance(atom, tuple):
+                    kind = atom[0]
+                    if kind == "and":
+                        queue.extend(atom[1])
+                    elif kind == "not" and atom[1] in atoms:
+                        return state.clash()
+                    elif kind == "some":
+                        state.existentials.append(atom)
+                        queue.extend(self._above(atom[1])[1])
+                    elif kind == "all":
+                        state.universals[atom[1]].add(atom[2])
+                    elif kind == "min":
+                        state.at_least[atom[1:3]] = max(state.at_least.get(atom[1:3], 0), atom[3])
+                    elif kind == "max":
+                        state.at_most[atom[1]].append(atom[2:])
+            queue.extend(c for c in state.conjunctions if c not in atoms and c[1] <= atoms)
+            for atom in state.existentials:
+                props, _, ranges, functional = self._above(atom[1])
+                filler = frozenset({atom[2]}.union(ranges, *(state.universals[p] for p in props if p in state.universals)))
+                successor = self._context(filler)
+                self.watchers[filler].add(context)
+                if successor.unsatisfiable or self._cardinality_clash(props, functional, state.at_least.get(atom[1:], 1), state.at_most, successor.atoms):
+                    return state.clash()
+                for p in props:
+                    queue.extend(e for e in self.lhs_existentials.get(p, ()) if e not in atoms and e[2] in successor.atoms)
+            if not queue:
+                return len(atoms) != size
+
+    @staticmethod
+    def _cardinality_clash(props, functional, n, at_most, successor):
+        """At least n successors through a sub-property of a max m restriction (or functional property) whose class they all belong to, n > m."""
+        if n > 1 and functional:
+            return True
+        return any(n > m and (c == THING or c in successor) for p in props for c, m in at_most.get(p, ()))
+
+    def run(self, step_budget: int = REASONING_STEP_BUDGET):
+        """Saturates every named class and individual; stops with complete=False after step_budget context saturations."""
+        steps = 0
+        for c in self.classes:
+            self._context(frozenset([c]))
+        for a in self.individuals:
+            self._context(frozenset([("value", a)]))
+        while self.pending:
+            if steps >= step_budget:
+                self.complete = False
+                break
+            steps += 1
+            context = self.pending.popleft()
+            self.queued.discard(context)
+            if self._saturate(context):
+                for watcher in self.watchers[context]:
+                    self._schedule(watcher)
+        return self
+
+    def is_unsatisfiable(self, atoms):
+        state = self.saturated.get(frozenset(atoms))
+        return state is not None and state.unsatisfiable
+
+    def unsatisfiable(self):
+        return {c for c in self.classes if c != NOTHING and self.is_unsatisfiable([c])}
+
+    def inconsistent_individuals(self):
+        return {a for a in self.individuals if self.is_unsatisfiable([("value", a)])}
+
+class _Context:
+    """Atoms derived so far for one context, with the per-property bookkeeping the existential rules read."""
+    def __init__(self, atoms):
+        self.atoms = set()
+        self.queue = deque(atoms)
+        self.queue.append(THING)
+        self.unsatisfiable = False
+        self.conjunctions, self.existentials = [], []
+        self.universals, self.at_least, self.at_most = defaultdict(set), {}, defaultdict(list)
+
+    def clash(self):
+        self.unsatisfiable = True
+        self.atoms.add(NOTHING)
+        return True
@@ -0,0 +1,104 @@
+import importlib.util, json, os
+
+ARROW_EXTENSIONS = (".arrow", ".feather")
+
+def has_pyarrow():
+    return importlib.util.find_spec("pyarrow") is not None
+
+def _require_pyarrow(path):
+    """pyarrow and pyarrow.parquet, imported on first use of a Parquet/Arrow results file."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError(f"Parquet/Arrow results ({path}) need pyarrow: pip install pyarrow")
+    return pa, pq
+
+def read_results(results_path: str):
+    """Results written by write_results. Arrow IPC files are memory-mapped and stay Arrow-backed, so loading them copies nothing."""
+    import pandas as pd
+    ext = os.path.splitext(results_path)[1].lower()
+    if ext in ARROW_EXTENSIONS:
+        pa, _ = _require_pyarrow(results_path)
+        return pa.ipc.open_file(pa.memory_map(results_path)).read_all().to_pandas(types_mapper=pd.ArrowDtype)
+    if ext == ".parquet":
+        _, pq = _require_pyarrow(results_path)
+        return pq.read_table(results_path, memory_map=True).to_pandas(types_mapper=pd.ArrowDtype)
+    return pd.read_csv(results_path, sep=";", float_precision="round_trip")
+
+def write_results(results: "pandas.DataFrame", output_path: str):
+    """Writes results as a semicolon CSV, Parquet or Arrow IPC file depending on the extension, replacing output_path atomically."""
+    ext = os.path.splitext(output_path)[1].lower()
+    tmp_path = output_path + ".tmp"
+    if ext in ARROW_EXTENSIONS or ext == ".parquet":
+        pa, pq = _require_pyarrow(output_path)
+        table = pa.Table.from_pandas(results, preserve_index=False)
+        if ext == ".parquet":
+            pq.write_table(table, tmp_path)
+        else:
+            with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    else:
+        results.to_csv(tmp_path, sep=";", index=False)
+    os.replace(tmp_path, output_path)
+
+def _json_value(value):
+    return value.item() if hasattr(value, "item") else str(value)
+
+class ResultJournal:
+    """Append-only JSON-lines log of result rows keyed by key_column, flushed to disk row by row.
+
+    The first line holds the run fingerprint. A journal left behind by an interrupted run with the same fingerprint
+    is resumed: its rows are in self.rows and need not be recomputed (a torn last line is dropped). Any other
+    journal is discarded. close() removes the journal once the run's results are complete.
+    """
+    def __init__(self, path: str, key_column: str, fingerprint: str):
+        self.path = path
+        self.key_column = key_column
+        self.fingerprint = fingerprint
+        self.rows = {}
+        self._file = None
+        if os.path.isfile(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.read().split("\n")
+        try:
+            if json.loads(lines[0]).get("fingerprint") != self.fingerprint:
+                return
+        except (ValueError, AttributeError):
+            return
+        for line in lines[1:]:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                break
+            self.rows[row[self.key_column]] = row
+
+    def __contains__(self, key):
+        return key in self.rows
+
+    def _open(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"fingerprint": self.fingerprint}) + "\n")
+            for row in self.rows.values():
+                f.write(json.dumps(row, default=_json_value) + "\n")
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def append(self, row: dict):
+        if self._file is None:
+            self._open()
+        self._file.write(json.dumps(row, default=_json_value) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.rows[row[self.key_column]] = row
+
+    def close(self, remove: bool = True):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if remove and os.path.isfile(self.path):
+            os.remove(self.path)
@@ -0,0 +1,262 @@
+"""Long-running evaluation service that keeps parsed ontologies warm between requests.
+
+    python -m Assets.Service --port 8765 --memory-mb 1024
+    python -m Assets.Service --socket /tmp/ontology-evaluator.sock
+
+    curl -s localhost:8765/evaluate -d '{"paths": ["Ontologies/SEAS"], "mode": "work"}'
+    curl -s --unix-socket /tmp/ontology-evaluator.sock http://localhost/stats
+"""
+import argparse, json, os, pickle, socketserver, threading, time
+from collections import OrderedDict, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from Assets.Cache import ParseCache, file_hash
+from Assets.Evaluation import evaluate_work, index_file
+from Assets.Index import TripleIndex
+from Assets.Metrics import Metrics
+from Assets.Utils import find_ontology_files
+
+# In-memory size of a TripleIndex relative to its pickle, measured with tracemalloc on the evaluated ontologies (5-8x)
+INDEX_MEMORY_FACTOR = 6
+# The same for a metrics row (about 3.6x)
+ROW_MEMORY_FACTOR = 4
+
+def row_size(row):
+    return ROW_MEMORY_FACTOR * len(pickle.dumps(row, pickle.HIGHEST_PROTOCOL))
+
+class PoolEntry:
+    """A file's index and the rows computed from it, or (index None) a work row; size covers both."""
+    def __init__(self, stat, digest, index: TripleIndex, size: int):
+        self.stat = stat
+        self.digest = digest
+        self.index = index
+        self.size = size
+        self.rows = {}
+
+class IndexPool:
+    """LRU pool of mergeable TripleIndexes, plus the metrics rows computed from them and the work rows, bounded by max_bytes.
+
+    An entry is reused while its file's size and mtime are unchanged, or, when they changed, while its content
+    hash is; otherwise the file is re-indexed. Entry sizes are estimated from the pickled size of the index and
+    rows (see INDEX_MEMORY_FACTOR). A file is indexed by one thread at a time; other requests for it wait for that result.
+    """
+    def __init__(self, max_bytes: int = 512 << 20, cache: ParseCache = None):
+        self.max_bytes = max_bytes
+        self.cache = cache
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self._loading = defaultdict(threading.Lock)
+
+    def _fresh(self, path, stat):
+        entry = self.entries.get(path)
+        if entry is None:
+            return None
+        if entry.stat != stat:
+            if entry.digest != file_hash(path):
+                return None
+            entry.stat = stat
+        self.entries.move_to_end(path)
+        return entry
+
+    def get(self, path: str) -> PoolEntry:
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        stat = (st.st_size, st.st_mtime_ns)
+        with self.lock:
+            loading = self._loading[path]
+        try:
+            with loading:
+                with self.lock:
+                    entry = self._fresh(path, stat)
+                    if entry is not None:
+                        self.hits += 1
+                        return entry
+                    self.misses += 1
+                digest = file_hash(path)
+                index = index_file(path, self.cache.clone() if self.cache is not None else None, mergeable=True)
+                entry = PoolEntry(stat, digest, index, INDEX_MEMORY_FACTOR * len(pickle.dumps(index, pickle.HIGHEST_PROTOCOL)))
+                with self.lock:
+                    self._put(path, entry)
+                return entry
+        finally:
+            # Waiting threads hold the lock object itself: the map only has to find it while the file is loading
+            with self.lock:
+                if self._loading.get(path) is loading:
+                    del self._loading[path]
+
+    def add_row(self, path, entry: PoolEntry, key, row):
+        """Keeps row in entry.rows under key, charging its size to the budget."""
+        size = row_size(row)
+        with self.lock:
+            entry.rows[key] = row
+            entry.size += size
+            if self.entries.get(os.path.abspath(path)) is entry:
+                self.bytes += size
+                self._shrink()
+
+    def work_row(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            return entry.rows[key]
+
+    def add_work_row(self, key, row):
+        entry = PoolEntry(None, None, None, row_size(row))
+        entry.rows[key] = row
+        with self.lock:
+            self._put(key, entry)
+
+    def _put(self, key, entry):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old.size
+        if entry.size > self.max_bytes:
+            return
+        self.entries[key] = entry
+        self.bytes += entry.size
+        self._shrink()
+
+    def _shrink(self):
+        while self.bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= evicted.size
+
+    def stats(self):
+        with self.lock:
+            return {"entries": len(self.entries), "bytes": self.bytes, "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses}
+
+class EvaluationService:
+    """Evaluates files or works (a file or a directory of modules) from the IndexPool; rows of unchanged files are served as computed."""
+    def __init__(self, ontologies_base_urls: dict, pool: IndexPool = None):
+        self.ontologies_base_urls = ontologies_base_urls
+        self.pool = pool if pool is not None else IndexPool()
+
+    def evaluate_file(self, path, root=None, add_other_indicators=False):
+        entry = self.pool.get(path)
+        row = entry.rows.get(add_other_indicators)
+        if row is None:
+            try:
+                row = Metrics(index=entry.index).run(add_other_indicators=add_other_indicators)
+            except Exception as e:
+                print(f"Failed to evaluate {path}: {e}")
+                row = {"Error": f"{type(e).__name__}: {e}"}
+            self.pool.add_row(path, entry, add_other_indicators, row)
+        return dict(row, **{"Ontology File": os.path.relpath(path, root) if root else path})
+
+    def evaluate_work(self, path, add_other_indicators=False):
+        is_dir = os.path.isdir(path)
+        files = list(find_ontology_files(path)) if is_dir else [path]
+        entries = [self.pool.get(file_path) for file_path in files]
+        key = (os.path.abspath(path), tuple(entry.digest for entry in entries), add_other_indicators)
+        row = self.pool.work_row(key)
+        if row is None:
+            name = os.path.basename(os.path.normpath(path))
+            row = evaluate_work(TripleIndex.merged(entry.index for entry in entries), name, is_dir, add_other_indicators, None, self.ontologies_base_urls)
+            self.pool.add_work_row(key, row)
+        return dict(row)
+
+    def evaluate(self, paths, mode: str = "file", add_other_indicators: bool = False):
+        """Metrics rows for paths: per file (directories are expanded) or, with mode="work", one row per path."""
+        if mode not in ("file", "work"):
+            raise ValueError(f"Unknown mode: {mode}")
+        rows = []
+        for path in paths:
+            if not os.path.exists(path):
+                raise ValueError(f"No such file or directory: {path}")
+            if mode == "work":
+                rows.append(self.evaluate_work(path, add_other_indicators))
+            elif os.path.isdir(path):
+                rows += [self.evaluate_file(file_path, path, add_other_indicators) for file_path in find_ontology_files(path)]
+            else:
+                rows.append(self.evaluate_file(path, None, add_other_indicators))
+        return rows
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """POST /evaluate {"paths": [...], "mode": "file" | "work", "add_other_indicators": false}; GET /stats; GET /health."""
+    service: EvaluationService = None
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self._send(200, self.service.pool.stats())
+        else:
+            self._send(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/evaluate":
+            self._send(404, {"error": f"Unknown endpoint: {self.path}"})
+            return
+        start = time.perf_counter()
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            rows = self.service.evaluate(request["paths"], request.get("mode", "file"), request.get("add_other_indicators", False))
+        except (KeyError, TypeError, ValueError, OSError) as e:
+            self._send(400, {"error": f"{type(e).__name__}: {e}"})
+            return
+        except Exception as e:
+            print(f"Failed to serve {self.path}: {type(e).__name__}: {e}")
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self._send(200, {"results": rows, "seconds": time.perf_counter() - start})
+
+    def address_string(self):
+        return self.client_address[0] if self.client_address else "unix-socket"
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+        super().server_bind()
+        self.server_name, self.server_port = "localhost", 0
+
+def make_server(service: EvaluationService, host: str = "127.0.0.1", port: int = 8765, socket_path: str = None):
+    handler = type("BoundServiceHandler", (ServiceHandler,), {"service": service})
+    if socket_path:
+        return ThreadingUnixHTTPServer(socket_path, handler)
+    return ThreadingHTTPServer((host, port), handler)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--memory-mb", type=int, default=512, help="memory budget of the warm index pool")
+    parser.add_argument("--base-urls", default="baseURLperOntology.json", help="JSON map of work name to base URL")
+    parser.add_argument("--cache-dir", default=".cache/graphs", help="parse cache directory ('' to disable)")
+    args = parser.parse_args(argv)
+
+    base_urls = {}
+    if os.path.isfile(args.base_urls):
+        with open(args.base_urls, encoding="utf-8") as f:
+            base_urls = json.load(f)
+    else:
+        print(f"Warning: {args.base_urls} not found, reuse is attributed to well-known vocabularies only")
+    pool = IndexPool(args.memory_mb << 20, ParseCache(args.cache_dir) if args.cache_dir else None)
+    server = make_server(EvaluationService(base_urls, pool), args.host, args.port, args.socket)
+    print(f"✅ Evaluation service listening on {args.socket or f'http://{args.host}:{args.port}'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import numpy as np
+from rdflib import Graph, BNode, RDF, RDFS, OWL
+from Assets.Index import TripleIndex, AXIOM_PREDICATES, TRACKED_TYPES, TRACKED_SUBJECTS, REASONING_PREDICATES, is_reasoning_type, is_schema_type
+
+class TermTable:
+    """Interns RDF terms to consecutive integer ids."""
+    def __init__(self, terms=None):
+        self.terms = list(terms or [])
+        self.ids = {term: i for i, term in enumerate(self.terms)}
+
+    def intern(self, term):
+        i = self.ids.get(term)
+        if i is None:
+            i = self.ids[term] = len(self.terms)
+            self.terms.append(term)
+        return i
+
+    def id_of(self, term):
+        return self.ids.get(term, -1)
+
+    def blank_mask(self):
+        return np.fromiter((isinstance(term, BNode) for term in self.terms), dtype=bool, count=len(self.terms))
+
+class TripleArrays:
+    """Triples of a graph as one (n, 3) int32 array of subject/predicate/object term ids.
+
+    Building a TripleIndex from the arrays uses vectorized masks per tracked predicate; only the
+    matching ids are turned back into rdflib terms, so the cost in Python objects scales with the
+    entities rather than the triples.
+    """
+    def __init__(self, table: TermTable = None, rows: np.ndarray = None):
+        self.table = table if table is not None else TermTable()
+        self.rows = rows if rows is not None else np.empty((0, 3), dtype=np.int32)
+
+    @classmethod
+    def from_graph(cls, g: Graph):
+        table = TermTable()
+        flat = np.fromiter((table.intern(term) for triple in g for term in triple), dtype=np.int32, count=3 * len(g))
+        return cls(table, flat.reshape(-1, 3))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def triples(self):
+        terms = self.table.terms
+        return ((terms[s], terms[p], terms[o]) for s, p, o in self.rows.tolist())
+
+    def _terms(self, ids):
+        terms = self.table.terms
+        return {terms[i] for i in np.unique(ids).tolist()}
+
+    def _pairs(self, mask):
+        terms = self.table.terms
+        return [(terms[s], terms[o]) for s, o in self.rows[mask][:, [0, 2]].tolist()]
+
+    def to_index(self, mergeable: bool = False, axioms: bool = True):
+        """Same TripleIndex as TripleIndex.from_graph over these triples."""
+        index = TripleIndex(mergeable, axioms)
+        terms, s, p, o = self.table.terms, self.rows[:, 0], self.rows[:, 1], self.rows[:, 2]
+        index.triple_count = len(self.rows)
+        counts = np.bincount(p, minlength=len(terms))
+        if mergeable:
+            blank = self.table.blank_mask()
+            ground = ~(blank[s] | blank[o])
+            schema_types = np.fromiter((is_schema_type(term) for term in terms), dtype=bool, count=len(terms))
+        for pid in np.flatnonzero(counts).tolist():
+            predicate, count = terms[pid], int(counts[pid])
+            if mergeable and predicate in AXIOM_PREDICATES:
+                mask = (p == pid) & ground
+                if predicate == RDF.type:
+                    mask &= schema_types[o]
+                index.ground[predicate] = set(self._pairs(mask))
+                count -= len(index.ground[predicate])
+            if count:
+                index.predicate_counts[predicate] = count
+        type_mask = p == self.table.id_of(RDF.type)
+        for rdf_type in TRACKED_TYPES:
+            tid = self.table.id_of(rdf_type)
+            if tid >= 0:
+                index.typed[rdf_type] = self._terms(s[type_mask & (o == tid)])
+        for predicate in TRACKED_SUBJECTS:
+            pid = self.table.id_of(predicate)
+            if pid >= 0:
+                index.subjects_with[predicate] = self._terms(s[p == pid])
+        for child, parent in self._pairs(p == self.table.id_of(RDFS.subClassOf)):
+            index.superclasses[child].add(parent)
+        index.imports = self._terms(o[p == self.table.id_of(OWL.imports)])
+        index.version_iris = self._terms(o[p == self.table.id_of(OWL.versionIRI)])
+        if not axioms:
+            return index
+        reasoning_types = np.fromiter((is_reasoning_type(term) for term in terms), dtype=bool, count=len(terms))
+        axiom_mask = np.isin(p, [self.table.id_of(predicate) for predicate in REASONING_PREDICATES]) | (type_mask & reasoning_types[o])
+        index.axioms = {(terms[si], terms[pi], terms[oi]) for si, pi, oi in self.rows[axiom_mask].tolist()}
+        return index
@@ -1,14 +1,65 @@
-import re
+import os, re
 from rdflib import Graph, URIRef
+from Assets.Archives import archive_files
+from Assets.Index import TripleIndex, IndexSink
+from Assets.Parsing import LINE_FORMATS, index_lines, parse_file, sniff_format
 
-def load_graph(file_path):
+ONTO_EXTENSIONS = {'.ttl', '.rdf', '.owl', '.nt', '.nq'}
+# Set by strict_parsing: a file that fails to parse raises instead of giving an empty graph or index
+STRICT_PARSING = False
+
+def strict_parsing():
+    """Makes parse failures in this process raise; isolated children (Isolation.run_isolated) call it, so that the
+    evaluate_* tasks turn such a file into an Error row rather than all-zero metrics."""
+    global STRICT_PARSING
+    STRICT_PARSING = True
+
+def parse_failed(file_path, error):
+    if STRICT_PARSING:
+        raise error
+    print(f"Failed to parse {file_path}: {error}")
+
+def find_ontology_files(directory):
+    """Ontology files under directory, which may also be a zip/tar/rar archive or a folder inside one."""
+    members = archive_files(directory)
+    if members is not None:
+        yield from (path for path in members if any(path.endswith(ext) for ext in ONTO_EXTENSIONS))
+        return
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if any(file.endswith(ext) for ext in ONTO_EXTENSIONS):
+                yield os.path.join(root, file)
+
+def load_graph(file_path, cache=None):
     g = Graph()
     try:
-        g.parse(file_path)
+        if cache is not None:
+            cache.parse_into(g, file_path)
+        else:
+            parse_file(g, file_path)
     except Exception as e:
-        print(f"Failed to parse {file_path}: {e}")
+        parse_failed(file_path, e)
     return g
 
+def load_index(file_path, mergeable: bool = False, jobs: int = None, axioms: bool = True):
+    """Streaming counterpart of load_graph: builds the TripleIndex straight from the parser, without materializing a Graph.
+
+    Memory grows with the entity sets, label/comment subjects and named axiom triples instead of the triple count.
+    Axioms stated twice in the source are counted once per statement; only a mergeable index, which keeps the
+    axiom triples to de-duplicate them against other files, collapses them as a Graph would.
+    N-Triples/N-Quads files are read by index_lines, which splits large ones across jobs processes.
+    With axioms=False the axiom triples of the Reasoner are not kept, which is most of the memory of a large index.
+    """
+    index = TripleIndex(mergeable, axioms)
+    try:
+        fmt = sniff_format(file_path)
+        if fmt in LINE_FORMATS:
+            return index_lines(file_path, fmt, mergeable, jobs, axioms)
+        parse_file(IndexSink(index), file_path)
+    except Exception as e:
+        parse_failed(file_path, e)
+    return index
+
 def get_local_name(uri):
     """Extracts the local part of a URI (after last # or /)"""
     if isinstance(uri, URIRef):
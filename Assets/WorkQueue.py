@@ -0,0 +1,245 @@
+"""Work queue in a shared SQLite file, so that workers on several machines evaluate one corpus together.
+
+    python main.py queue create /shared/nightly.sqlite /shared/Ontologies --imports
+    python main.py queue work /shared/nightly.sqlite --jobs 8        # on every node
+    python main.py queue status /shared/nightly.sqlite
+    python main.py queue merge /shared/nightly.sqlite                # same result files as evaluate --full
+
+Each item is one work (a top-level file or subdirectory of root) with all of its files, as a work's row needs the
+summaries of every one of them. The queue holds the run configuration, the items and every result row, so workers need
+no other arguments, and a run can be merged, or reset and evaluated again, from the queue file alone.
+
+A worker holds a lease on its item and renews it while it runs. An item whose lease ran out (a node that crashed or
+hung) is claimed again by the next worker, and failed for good after max_attempts claims. The queue uses SQLite's
+rollback journal, whose file locks work on network filesystems, rather than WAL, which needs memory shared on one host.
+"""
+import contextlib, datetime, json, os, socket, sqlite3, threading, time
+from Assets.Evaluation import TASK_FAILURES, aggregate_work, evaluate_file, file_frame, find_works, reuse_matrix, run_tasks, work_frame
+from Assets.Imports import ImportResolver
+from Assets.Indicators import needs_axioms
+from Assets.Isolation import Limits
+from Assets.Metrics import CLASSES_SUFFIX, METRICS_VERSION
+from Assets.Results import _json_value, write_results
+from Assets.Utils import find_ontology_files
+
+LEASE_SECONDS = 600
+MAX_ATTEMPTS = 3
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS config (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY, work TEXT NOT NULL UNIQUE, is_dir INTEGER NOT NULL, state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT, lease_until REAL, attempts INTEGER NOT NULL DEFAULT 0, error TEXT, work_row TEXT, finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    position INTEGER PRIMARY KEY, item_id INTEGER NOT NULL REFERENCES items(id), rel_path TEXT NOT NULL UNIQUE, row TEXT
+);
+CREATE INDEX IF NOT EXISTS items_by_state ON items (state, lease_until);
+CREATE INDEX IF NOT EXISTS files_by_item ON files (item_id);
+"""
+
+class WorkQueue:
+    def __init__(self, path: str):
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=DELETE")
+        self.db.executescript(SCHEMA)
+        self._config = None
+
+    def close(self):
+        self.db.close()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    @property
+    def config(self):
+        if self._config is None:
+            self._config = {key: json.loads(value) for key, value in self.db.execute("SELECT key, value FROM config")}
+        return self._config
+
+    @classmethod
+    def create(cls, path: str, root: str, ontologies_base_urls: dict, add_other_indicators: bool = False, try_import_external_ontologies: bool = False,
+               indicator_options: dict = None, ontology_c_output: str = "OntologyClasses", lease_seconds: float = LEASE_SECONDS, max_attempts: int = MAX_ATTEMPTS,
+               limits: Limits = None, allow_network_imports: bool = False):
+        """New queue holding one item per work of root. Paths are stored absolute: root must be mounted at the same path on every node.
+
+        With limits, workers evaluate every file and work in a child process under them (see Isolation.Limits), so a file
+        that hangs becomes an Error row instead of a lease renewed forever.
+        """
+        if os.path.exists(path):
+            raise FileExistsError(f"{path} already exists (use queue reset to run it again)")
+        queue = cls(path)
+        root = os.path.abspath(root)
+        config = {
+            "root": root, "ontologies_base_urls": ontologies_base_urls, "add_other_indicators": add_other_indicators,
+            "try_import_external_ontologies": try_import_external_ontologies, "indicator_options": indicator_options,
+            "ontology_c_output": os.path.abspath(ontology_c_output), "lease_seconds": lease_seconds, "max_attempts": max_attempts,
+            "limits": vars(limits) if limits is not None else None, "allow_network_imports": allow_network_imports,
+            "metrics_version": METRICS_VERSION, "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+        }
+        with queue._transaction():
+            queue.db.executemany("INSERT INTO config VALUES (?, ?)", [(key, json.dumps(value)) for key, value in config.items()])
+            item_ids = {entry.name: queue.db.execute("INSERT INTO items (work, is_dir) VALUES (?, ?)", (entry.name, is_dir)).lastrowid
+                        for entry, is_dir in find_works(root)}
+            files = [os.path.relpath(file_path, root) for file_path in find_ontology_files(root)]
+            queue.db.executemany("INSERT INTO files (position, item_id, rel_path) VALUES (?, ?, ?)",
+                                 [(position, item_ids[rel_path.split(os.sep)[0]], rel_path) for position, rel_path in enumerate(files)
+                                  if rel_path.split(os.sep)[0] in item_ids])
+        print(f"Queued {len(item_ids)} works ({len(files)} files) of {root} in {path}")
+        return queue
+
+    def claim(self, worker: str):
+        """(id, work, is_dir) of the next pending item, or of one whose lease expired, now leased to worker; None when nothing is left."""
+        now = time.time()
+        with self._transaction():
+            self.db.execute("UPDATE items SET state = 'failed', error = 'Lease expired ' || attempts || ' times (last worker: ' || worker || ')' "
+                            "WHERE state = 'leased' AND lease_until < ? AND attempts >= ?", (now, self.config["max_attempts"]))
+            item = self.db.execute("SELECT id, work, is_dir FROM items WHERE state = 'pending' OR (state = 'leased' AND lease_until < ?) "
+                                   "ORDER BY id LIMIT 1", (now,)).fetchone()
+            if item is not None:
+                self.db.execute("UPDATE items SET state = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+                                (worker, now + self.config["lease_seconds"], item[0]))
+        return item
+
+    def renew(self, item_id: int, worker: str):
+        """Extends worker's lease on item_id; False when the lease was lost to another worker."""
+        with self._transaction():
+            return self.db.execute("UPDATE items SET lease_until = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                                   (time.time() + self.config["lease_seconds"], item_id, worker)).rowcount > 0
+
+    def complete(self, item_id: int, worker: str, work_row: dict, file_rows: dict):
+        """Stores the rows of an item. Rows are deterministic, so whichever worker finishes an item first wins."""
+        with self._transaction():
+            if self.db.execute("UPDATE items SET state = 'done', worker = ?, lease_until = NULL, error = NULL, work_row = ?, finished_at = ? "
+                               "WHERE id = ? AND state != 'done'", (worker, json.dumps(work_row, default=_json_value),
+                               datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"), item_id)).rowcount:
+                self.db.executemany("UPDATE files SET row = ? WHERE rel_path = ?",
+                                    [(json.dumps(row, default=_json_value), rel_path) for rel_path, row in file_rows.items()])
+
+    def fail(self, item_id: int, worker: str, error: str):
+        """Gives an item back for another attempt, or fails it once max_attempts claims are used up."""
+        with self._transaction():
+            self.db.execute("UPDATE items SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, lease_until = NULL, error = ? "
+                            "WHERE id = ? AND worker = ? AND state = 'leased'", (self.config["max_attempts"], error, item_id, worker))
+
+    def reset(self, failed_only: bool = False):
+        """Makes every item (or only the failed ones) pending again, dropping their rows."""
+        where = "WHERE state = 'failed'" if failed_only else ""
+        with self._transaction():
+            self.db.execute(f"UPDATE files SET row = NULL WHERE item_id IN (SELECT id FROM items {where})")
+            count = self.db.execute(f"UPDATE items SET state = 'pending', worker = NULL, lease_until = NULL, attempts = 0, error = NULL, "
+                                    f"work_row = NULL, finished_at = NULL {where}").rowcount
+        return count
+
+    def status(self):
+        counts = dict.fromkeys(("pending", "leased", "done", "failed"), 0)
+        counts.update(self.db.execute("SELECT state, COUNT(*) FROM items GROUP BY state"))
+        counts["expired"] = self.db.execute("SELECT COUNT(*) FROM items WHERE state = 'leased' AND lease_until < ?", (time.time(),)).fetchone()[0]
+        counts["workers"] = [worker for worker, in self.db.execute("SELECT DISTINCT worker FROM items WHERE state = 'leased' ORDER BY worker")]
+        return counts
+
+    def _keep_leased(self, item_id, worker, stop: threading.Event):
+        queue = WorkQueue(self.path)
+        try:
+            while not stop.wait(self.config["lease_seconds"] / 3):
+                if not queue.renew(item_id, worker):
+                    print(f"Warning: {worker} lost its lease on item {item_id}")
+                    return
+        finally:
+            queue.close()
+
+    def _evaluate(self, work, is_dir, rel_paths, cache, streaming, import_resolver):
+        config = self.config
+        root, options, add_other_indicators = config["root"], config["indicator_options"], config["add_other_indicators"]
+        limits = Limits(**config["limits"]) if config.get("limits") else None
+        paths = [os.path.join(root, rel_path) for rel_path in rel_paths]
+        file_rows, summaries, failed = {}, [], []
+        tasks = [(file_path, root, add_other_indicators, True, cache, streaming, None, options) for file_path in paths]
+        for rel_path, (metrics, summary, _) in zip(rel_paths, run_tasks(evaluate_file, tasks, 1, limits)):
+            file_rows[rel_path] = metrics
+            if summary is None:
+                failed.append(rel_path)
+            else:
+                summaries.append(summary)
+        # A work missing killed or failed files is no result: the item fails, to be tried again or reported by merge
+        if failed:
+            raise ChildProcessError(f"no summary of {', '.join(failed)}")
+        txt_path = os.path.join(config["ontology_c_output"], work + CLASSES_SUFFIX)
+        task = (os.path.join(root, work), work, is_dir, add_other_indicators, txt_path, config["ontologies_base_urls"], import_resolver, paths, summaries, cache, streaming, None, options)
+        (work_row, _, _), = run_tasks(aggregate_work, [task], 1, limits)
+        return work_row, file_rows
+
+    def work(self, worker: str = None, cache=None, streaming: bool = False):
+        """Claims and evaluates items until none is left; returns how many this worker completed."""
+        worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+        config = self.config
+        if config["metrics_version"] != METRICS_VERSION:
+            raise ValueError(f"Queue {self.path} was created with metrics version {config['metrics_version']}, this worker computes {METRICS_VERSION}")
+        os.makedirs(config["ontology_c_output"], exist_ok=True)
+        import_resolver = None
+        if config["try_import_external_ontologies"]:
+            import_resolver = ImportResolver.for_directory(config["root"], cache=cache, streaming=streaming, allow_network=config.get("allow_network_imports", False), axioms=needs_axioms(config["indicator_options"]))
+        completed = 0
+        while (item := self.claim(worker)) is not None:
+            item_id, work, is_dir = item
+            rel_paths = [rel_path for rel_path, in self.db.execute("SELECT rel_path FROM files WHERE item_id = ? ORDER BY position", (item_id,))]
+            print(f"{worker}: evaluating {work} ({len(rel_paths)} files)")
+            stop = threading.Event()
+            lease = threading.Thread(target=self._keep_leased, args=(item_id, worker, stop), daemon=True)
+            lease.start()
+            try:
+                work_row, file_rows = self._evaluate(work, is_dir, rel_paths, cache, streaming, import_resolver)
+            except Exception as e:
+                print(f"Failed to evaluate {work}: {e}")
+                self.fail(item_id, worker, f"{type(e).__name__}: {e}")
+                continue
+            finally:
+                stop.set()
+                lease.join()
+            self.complete(item_id, worker, work_row, file_rows)
+            completed += 1
+        return completed
+
+    def merge(self, work_out: str, file_out: str, reuse_out: str = None, partial: bool = False):
+        """Writes the result files of the run, in the layout of OntologyEvaluator.process_all; failed items get Error rows."""
+        unfinished = self.db.execute("SELECT COUNT(*) FROM items WHERE state IN ('pending', 'leased')").fetchone()[0]
+        if unfinished and not partial:
+            raise ValueError(f"{unfinished} items of {self.path} are not finished yet")
+        work_metrics, errors = [], {}
+        for item_id, work, is_dir, state, error, work_row in self.db.execute("SELECT id, work, is_dir, state, error, work_row FROM items ORDER BY id"):
+            if work_row is None:
+                errors[item_id] = error or f"Not evaluated ({state})"
+                work_row = json.dumps({"Error": errors[item_id], "Ontology Source": work, "Source Type": "subdirectory" if is_dir else "file"})
+            work_metrics.append(json.loads(work_row))
+        file_metrics = [json.loads(row) if row is not None else {"Error": errors.get(item_id, "Not evaluated"), "Ontology File": rel_path}
+                        for item_id, rel_path, row in self.db.execute("SELECT item_id, rel_path, row FROM files ORDER BY position")]
+        reuse = reuse_matrix(work_metrics)
+        for output_path, results in ((work_out, work_frame(work_metrics)), (file_out, file_frame(file_metrics))):
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            write_results(results, output_path)
+            print(f"\n✅ Metrics saved to: {output_path}")
+        if reuse_out:
+            reuse.to_csv(reuse_out, sep=";", index_label="Ontology Source")
+            print(f"\n✅ Reuse matrix saved to: {reuse_out}")
+
+def run_worker(path: str, cache_dir: str = None, streaming: bool = False):
+    """Worker process of `main.py queue work --jobs N`."""
+    from Assets.Cache import ParseCache
+    queue = WorkQueue(path)
+    try:
+        return queue.work(cache=ParseCache(cache_dir) if cache_dir else None, streaming=streaming)
+    finally:
+        queue.close()
+
+def _worker_failure(task, reason, elapsed):
+    print(f"Failed to run a worker of {task[0]}: {reason}")
+    return 0
+
+TASK_FAILURES[run_worker] = _worker_failure
@@ -0,0 +1,122 @@
+"""Times parsing, indexing and every indicator group of Metrics on synthetic ontologies.
+
+    python -m Benchmarks.RunBenchmarks --sizes 200 2000 20000 --save-baseline Benchmarks/baseline.json
+    python -m Benchmarks.RunBenchmarks --sizes 200 2000 20000 --baseline Benchmarks/baseline.json --threshold 0.25
+
+With --baseline the run exits with status 1 when any stage is slower than baseline * (1 + threshold), or when the
+reasoner stops at its step budget on a case it used to finish.
+"""
+import argparse, json, os, sys, tempfile, time, tracemalloc
+from Assets.Metrics import Metrics
+from Assets.Utils import load_graph, load_index
+from Benchmarks.SyntheticOntology import SyntheticOntology, BASE_URL
+
+INDICATOR_GROUPS = [
+    "structural_indicators", "lexical_indicators", "logical_indicators", "constraint_indicators",
+    "hierarchy_indicators", "reasoning_indicators", "other_indicators", "usability_reusability_indicators"
+]
+
+def measure(fn, memory: bool = False):
+    """(seconds, peak traced bytes or None, result) of fn(); tracing is only switched on when memory is requested."""
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return seconds, peak, result
+
+def benchmark_file(path, memory: bool = False, repeat: int = 1):
+    """Best-of-repeat timings per stage for one ontology file."""
+    stages = {}
+    def record(stage, fn):
+        best = None
+        for _ in range(repeat):
+            seconds, peak, result = measure(fn, memory)
+            if best is None or seconds < best[0]:
+                best = (seconds, peak, result)
+        stages[stage] = {"seconds": best[0], "peak_bytes": best[1]}
+        return best[2]
+
+    g = record("load_graph", lambda: load_graph(path))
+    triples = len(g)
+    record("load_index (streaming)", lambda: load_index(path))
+    metrics = record("Metrics.__init__", lambda: Metrics(g, "synthetic.owl"))
+    for group in INDICATOR_GROUPS:
+        if group == "usability_reusability_indicators":
+            record(group, lambda: getattr(metrics, group)({"synthetic": BASE_URL}))
+        else:
+            record(group, lambda: getattr(metrics, group)())
+    stages["reasoning_indicators"]["complete"] = metrics.metrics["Reasoning Complete"]
+    for stage in stages.values():
+        stage["triples_per_second"] = triples / stage["seconds"] if stage["seconds"] else None
+    return triples, stages
+
+def run(sizes, formats, depth, restriction_density, label_coverage, memory, repeat, workdir):
+    results = {}
+    for size in sizes:
+        generator = SyntheticOntology(classes=size, properties=max(1, size // 5), depth=depth,
+                                      restriction_density=restriction_density, label_coverage=label_coverage)
+        for fmt in formats:
+            path = generator.write(os.path.join(workdir, f"synthetic-{size}.{fmt}"))
+            triples, stages = benchmark_file(path, memory, repeat)
+            case = f"{size} classes ({fmt})"
+            results[case] = {"triples": triples, "stages": stages}
+            print(f"\n{case}: {triples} triples, {os.path.getsize(path) / 1e6:.1f} MB")
+            for stage, values in stages.items():
+                peak = f"{values['peak_bytes'] / 1e6:9.1f} MB" if values["peak_bytes"] is not None else ""
+                rate = f"{values['triples_per_second']:14,.0f} triples/s" if values["triples_per_second"] else ""
+                print(f"  {stage:34s} {values['seconds']:9.4f} s {rate} {peak}")
+            os.remove(path)
+    return results
+
+def compare(results, baseline, threshold: float, min_seconds: float):
+    """Stages slower than the baseline by more than threshold (and by more than min_seconds, to ignore timer noise)."""
+    regressions = []
+    for case, values in results.items():
+        for stage, timing in values["stages"].items():
+            old = baseline.get(case, {}).get("stages", {}).get(stage)
+            if old is None:
+                continue
+            if timing["seconds"] > old["seconds"] * (1 + threshold) and timing["seconds"] - old["seconds"] > min_seconds:
+                regressions.append((case, stage, old["seconds"], timing["seconds"]))
+            elif old.get("complete") and timing.get("complete") is False:
+                regressions.append((case, stage + " (stopped at its step budget)", old["seconds"], timing["seconds"]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 2000, 20000], help="class counts to generate")
+    parser.add_argument("--formats", nargs="+", default=["owl", "ttl"], choices=["owl", "ttl"])
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--restriction-density", type=float, default=0.5)
+    parser.add_argument("--label-coverage", type=float, default=0.8)
+    parser.add_argument("--repeat", type=int, default=3, help="best-of-N timing per stage")
+    parser.add_argument("--memory", action="store_true", help="trace peak memory per stage (slows every stage down)")
+    parser.add_argument("--save-baseline", help="write the timings to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown ratio before failing")
+    parser.add_argument("--min-seconds", type=float, default=0.005, help="ignore slowdowns smaller than this")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = run(args.sizes, args.formats, args.depth, args.restriction_density, args.label_coverage, args.memory, args.repeat, workdir)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1)
+        print(f"\n✅ Baseline saved to: {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold, args.min_seconds)
+        for case, stage, old, new in regressions:
+            print(f"❌ {case} / {stage}: {old:.4f} s -> {new:.4f} s")
+        if regressions:
+            return 1
+        print("\n✅ No stage slower than the baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+import random
+from xml.sax.saxutils import escape
+
+BASE_URL = "http://example.org/synthetic"
+RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+RDFS_NS = "http://www.w3.org/2000/01/rdf-schema#"
+OWL_NS = "http://www.w3.org/2002/07/owl#"
+XSD_NS = "http://www.w3.org/2001/XMLSchema#"
+
+class SyntheticOntology:
+    """Deterministic OWL ontology generator for benchmarks, written straight to RDF/XML or Turtle text.
+
+    classes are spread over `depth` hierarchy levels, each class below the top level getting one parent in the
+    level above. restriction_density is the expected number of someValuesFrom/cardinality restrictions per
+    class and label_coverage the share of classes and properties that get an rdfs:label (half of those also
+    get an rdfs:comment). Nothing is held in memory besides the class and property names.
+    """
+    def __init__(self, classes: int = 1000, properties: int = 200, depth: int = 6, restriction_density: float = 0.5,
+                 label_coverage: float = 0.8, datatype_share: float = 0.3, seed: int = 42):
+        self.classes = [f"{BASE_URL}#Class{i}" for i in range(classes)]
+        n_datatype = int(properties * datatype_share)
+        self.obj_props = [f"{BASE_URL}#hasRelation{i}" for i in range(properties - n_datatype)]
+        self.data_props = [f"{BASE_URL}#hasValue{i}" for i in range(n_datatype)]
+        self.depth = max(1, depth)
+        self.restriction_density = restriction_density
+        self.label_coverage = label_coverage
+        self.seed = seed
+
+    def _parent(self, i, rng):
+        level_size = max(1, len(self.classes) // self.depth)
+        level = i // level_size
+        if level == 0:
+            return None
+        return self.classes[rng.randrange((level - 1) * level_size, min(level * level_size, len(self.classes)))]
+
+    def entities(self):
+        """Yields (iri, kind, parent, label, comment, restrictions) with restrictions as (property, filler, cardinality) tuples."""
+        rng = random.Random(self.seed)
+        for i, iri in enumerate(self.classes):
+            labeled = rng.random() < self.label_coverage
+            restrictions = []
+            for _ in range(int(self.restriction_density) + (rng.random() < self.restriction_density % 1)):
+                if self.obj_props:
+                    restrictions.append((rng.choice(self.obj_props), rng.choice(self.classes), rng.random() < 0.3))
+            yield iri, "class", self._parent(i, rng), labeled, labeled and rng.random() < 0.5, restrictions
+        for kind, props in (("object", self.obj_props), ("datatype", self.data_props)):
+            for iri in props:
+                labeled = rng.random() < self.label_coverage
+                yield iri, kind, None, labeled, labeled and rng.random() < 0.5, []
+
+    def write_turtle(self, path):
+        rng = random.Random(self.seed + 1)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"@prefix rdf: <{RDF_NS}> .\n@prefix rdfs: <{RDFS_NS}> .\n@prefix owl: <{OWL_NS}> .\n@prefix xsd: <{XSD_NS}> .\n\n")
+            f.write(f"<{BASE_URL}> a owl:Ontology .\n\n")
+            for iri, kind, parent, labeled, commented, restrictions in self.entities():
+                name = iri.rsplit("#", 1)[1]
+                lines = [{"class": "a owl:Class", "object": "a owl:ObjectProperty", "datatype": "a owl:DatatypeProperty"}[kind]]
+                if kind == "object":
+                    lines += [f"rdfs:domain <{rng.choice(self.classes)}>", f"rdfs:range <{rng.choice(self.classes)}>"]
+                elif kind == "datatype":
+                    lines += [f"rdfs:domain <{rng.choice(self.classes)}>", "rdfs:range xsd:string"]
+                if parent:
+                    lines.append(f"rdfs:subClassOf <{parent}>")
+                for prop, filler, cardinality in restrictions:
+                    if cardinality:
+                        lines.append(f"rdfs:subClassOf [ a owl:Restriction ; owl:onProperty <{prop}> ; owl:minCardinality \"1\"^^xsd:nonNegativeInteger ]")
+                    else:
+                        lines.append(f"rdfs:subClassOf [ a owl:Restriction ; owl:onProperty <{prop}> ; owl:someValuesFrom <{filler}> ]")
+                if labeled:
+                    lines.append(f"rdfs:label \"{name}\"@en")
+                if commented:
+                    lines.append(f"rdfs:comment \"Synthetic {kind} {name}.\"@en")
+                f.write(f"<{iri}> " + " ;\n    ".join(lines) + " .\n\n")
+
+    def write_rdfxml(self, path):
+        rng = random.Random(self.seed + 1)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f'<?xml version="1.0"?>\n<rdf:RDF xmlns:rdf="{RDF_NS}" xmlns:rdfs="{RDFS_NS}" xmlns:owl="{OWL_NS}">\n')
+            f.write(f'  <owl:Ontology rdf:about="{BASE_URL}"/>\n')
+            for iri, kind, parent, labeled, commented, restrictions in self.entities():
+                name = iri.rsplit("#", 1)[1]
+                tag = {"class": "owl:Class", "object": "owl:ObjectProperty", "datatype": "owl:DatatypeProperty"}[kind]
+                body = []
+                if kind == "object":
+                    body += [f'<rdfs:domain rdf:resource="{rng.choice(self.classes)}"/>', f'<rdfs:range rdf:resource="{rng.choice(self.classes)}"/>']
+                elif kind == "datatype":
+                    body += [f'<rdfs:domain rdf:resource="{rng.choice(self.classes)}"/>', f'<rdfs:range rdf:resource="{XSD_NS}string"/>']
+                if parent:
+                    body.append(f'<rdfs:subClassOf rdf:resource="{parent}"/>')
+                for prop, filler, cardinality in restrictions:
+                    if cardinality:
+                        inner = f'<owl:minCardinality rdf:datatype="{XSD_NS}nonNegativeInteger">1</owl:minCardinality>'
+                    else:
+                        inner = f'<owl:someValuesFrom rdf:resource="{filler}"/>'
+                    body.append(f'<rdfs:subClassOf><owl:Restriction><owl:onProperty rdf:resource="{prop}"/>{inner}</owl:Restriction></rdfs:subClassOf>')
+                if labeled:
+                    body.append(f'<rdfs:label xml:lang="en">{escape(name)}</rdfs:label>')
+                if commented:
+                    body.append(f'<rdfs:comment xml:lang="en">Synthetic {kind} {escape(name)}.</rdfs:comment>')
+                f.write(f'  <{tag} rdf:about="{iri}">\n    ' + "\n    ".join(body) + f"\n  </{tag}>\n")
+            f.write("</rdf:RDF>\n")
+
+    def write(self, path):
+        if path.endswith(".ttl"):
+            self.write_turtle(path)
+        else:
+            self.write_rdfxml(path)
+        return path
@@ -1,27 +1,297 @@
-from Assets.Evaluation import OntologyEvaluator
-
-ontologiesBaseUrl = {
-  "aid-em": "http://www.mascem.gecad.isep.ipp.pt/ontologies/aid-em.owl",
-  "call-for-proposal": "http://www.mascem.gecad.isep.ipp.pt/ontologies/call-for-proposal.owl",
-  "DABGEO": "http://www.purl.org/dabgeo",
-  "electricity-markets-results": "http://www.mascem.gecad.isep.ipp.pt/ontologies/electricity-markets-results.owl",
-  "ElectricityMarkets": "http://www.mascem.gecad.isep.ipp.pt/ontologies/electricity-markets.owl",
-  "em-kpi-1_1": "http://energy.linkeddata.es/em-kpi",
-  "EpexOntology": "http://www.mascem.gecad.isep.ipp.pt/ontologies/epex.owl",
-  "IEMS": "http://www.semanticweb.org/robertomonaco/ontologies",
-  "IESO": "https://www.gecad.isep.ipp.pt/ieso/v1.0.0",
-  "MibelOntology": "http://www.mascem.gecad.isep.ipp.pt/ontologies/mibel.owl",
-  "NordPool": "http://www.mascem.gecad.isep.ipp.pt/ontologies/nordpool.owl",
-  "OEMA": "http://www.purl.org/oema",
-  "OpenEnergyOntology": "http://openenergy-platform.org/ontology",
-  "saref4ener": "https://saref.etsi.org/saref4ener",
-  "SARGON": "https://w3id.org/saref",
-  "SEAS": "https://w3id.org/seas",
-  "ThinkHome": "https://www.auto.tuwien.ac.at/downloads/thinkhome"
-}
-
-OE = OntologyEvaluator(root="Ontologies", ontologiesBaseURL=ontologiesBaseUrl)
-OE.process_work(ontology_c_output="OntologyClasses", try_import_external_ontologies=False)
-OE.save_to_csv("MetricsResults/Ontology Metrics Per Work.csv")
-OE.process_file()
-OE.save_to_csv("MetricsResults/Ontology Metrics Per File.csv")
\ No newline at end of file
+"""Ontology evaluation from the command line.
+
+    python main.py                                   # evaluate Ontologies/ incrementally into MetricsResults/
+    python main.py evaluate Ontologies --indicators structural lexical --jobs 4
+    python main.py evaluate Ontologies.rar           # archives (zip, tar, rar) are read without extracting
+    python main.py evaluate --full --profile --cprofile SEAS  # timing/memory columns, SEAS under cProfile
+    python main.py check Ontologies/SEAS/seas.ttl --indicators structural
+    python main.py history trend SEAS "Class Documentation Coverage" --last 50
+    python main.py history diff                      # what changed since the last labeled run (evaluate --label)
+    python main.py overlap --classes-dir OntologyClasses --out-dir MetricsResults
+    python main.py queue create /shared/nightly.sqlite Ontologies  # then `queue work` on every node, `queue merge`
+    python main.py serve --port 8765
+
+Heavy backends load only with the feature that needs them: pandas when result tables are built, pyarrow for
+Parquet/Arrow result files, the reasoner when the reasoning group is selected.
+"""
+import argparse, json, os, sys
+
+ROOTS = ("Ontologies", "Ontologies.rar")
+HISTORY = "MetricsResults/Ontology Metrics History.sqlite"
+COMMANDS = ("evaluate", "check", "history", "overlap", "queue", "serve")
+
+def load_base_urls(path):
+    if not os.path.isfile(path):
+        print(f"Warning: {path} not found, reuse is attributed to well-known vocabularies only")
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def make_limits(args):
+    """Limits of the isolation options, or None to evaluate in-process."""
+    if args.time_limit is None and args.memory_limit is None:
+        return None
+    from Assets.Isolation import Limits
+    return Limits(args.time_limit, args.memory_limit, args.retries, args.limit_growth)
+
+def make_profiler(args):
+    """Profiler of the profiling options, or None when none is given."""
+    if not (args.profile or args.profile_trace or args.cprofile):
+        return None
+    from Assets.Profiling import Profiler
+    return Profiler(args.profile or bool(args.profile_trace), args.profile_trace, args.cprofile, args.cprofile_dir)
+
+def check(args):
+    """Metrics of single files, printed as JSON lines, without the parse cache or result tables."""
+    from Assets.Indicators import indicator_options, needs_axioms
+    from Assets.Metrics import Metrics
+    from Assets.Utils import load_index
+    options = indicator_options(args.indicators) or {}
+    status = 0
+    for file_path in args.files:
+        try:
+            metrics = Metrics(index=load_index(file_path, mergeable=False, axioms=needs_axioms(options))).run(add_other_indicators=args.other_indicators, **options)
+        except Exception as e:
+            print(f"Failed to evaluate {file_path}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        print(json.dumps({"Ontology File": file_path, **metrics}, default=str))
+    return status
+
+def evaluate(args):
+    args.roots = args.roots or [next((root for root in ROOTS if os.path.exists(root)), ROOTS[0])]
+    if args.reuse_out and len(args.roots) == 1 and not args.full:
+        print("Error: --reuse-out needs --full or several roots, incremental runs do not rebuild the reuse matrix", file=sys.stderr)
+        return 2
+    from Assets.Cache import ParseCache
+    from Assets.Evaluation import OntologyEvaluator
+    from Assets.Indicators import indicator_options, needs_axioms
+    from Assets.Results import has_pyarrow
+    def import_resolver(root):
+        if not args.network_imports:
+            return None
+        from Assets.Imports import ImportResolver
+        resolver = ImportResolver(cache=options["cache"], streaming=args.streaming, allow_network=True, axioms=needs_axioms(options["indicator_options"]))
+        resolver.add_xml_catalogs(root)
+        return resolver
+
+    options = dict(
+        ontologiesBaseURL=load_base_urls(args.base_urls), cache=None if args.no_cache else ParseCache(args.cache_dir),
+        streaming=args.streaming, journal_dir=args.journal_dir, indicator_options=indicator_options(args.indicators), limits=make_limits(args),
+        profiler=make_profiler(args))
+    run = dict(add_other_indicators=args.other_indicators, ontology_c_output=args.classes_out,
+               try_import_external_ontologies=args.imports or args.network_imports, jobs=args.jobs)
+    os.makedirs(args.classes_out, exist_ok=True)
+    for path in (args.work_out, args.file_out, args.reuse_out or args.work_out):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if len(args.roots) == 1 and not args.full:
+        OE = OntologyEvaluator(root=args.roots[0], import_resolver=import_resolver(args.roots[0]), **options)
+        OE.process_incremental(args.work_out, args.file_out, **run)
+        if args.arrow and has_pyarrow():
+            OE.save_results(os.path.splitext(args.work_out)[0] + ".arrow", OE.work_results)
+            OE.save_results(os.path.splitext(args.file_out)[0] + ".arrow", OE.file_results)
+    else:
+        import pandas as pd
+        evaluators = []
+        for root in args.roots:
+            OE = OntologyEvaluator(root=root, import_resolver=import_resolver(root), **options)
+            OE.process_all(**run)
+            evaluators.append(OE)
+        OE.save_results(args.work_out, pd.concat([e.work_results for e in evaluators], ignore_index=True))
+        OE.save_results(args.file_out, pd.concat([e.file_results for e in evaluators], ignore_index=True))
+        OE.reuse_matrix = pd.concat([e.reuse_matrix for e in evaluators]).fillna(0).astype(int).sort_index(axis=1)
+        if args.reuse_out:
+            OE.save_reuse_matrix(args.reuse_out)
+    if args.history:
+        record_history(args, [OE] if len(args.roots) == 1 and not args.full else evaluators)
+    if OE.cache is not None:
+        print(f"Parse cache: {OE.cache.hits} hits, {OE.cache.misses} misses")
+    return 0
+
+def record_history(args, evaluators):
+    from Assets.History import HistoryStore
+    from Assets.Manifest import Manifest
+    import pandas as pd
+    manifest = Manifest.load(os.path.join(os.path.dirname(args.file_out), "Ontology Metrics Manifest.json")) if len(evaluators) == 1 else None
+    file_hashes = {}
+    for OE in evaluators:
+        file_hashes.update(HistoryStore.content_hashes(OE.root, OE.file_results["Ontology File"], manifest))
+    store = HistoryStore(args.history)
+    run_id = store.record_run(pd.concat([OE.work_results for OE in evaluators], ignore_index=True),
+                              pd.concat([OE.file_results for OE in evaluators], ignore_index=True), file_hashes, args.label)
+    store.close()
+    print(f"\n✅ Run {run_id} recorded in: {args.history}")
+
+def history(args):
+    from Assets.History import HistoryStore
+    store = HistoryStore(args.history)
+    if args.action == "runs":
+        frame = store.runs(args.last)
+    elif args.action == "trend":
+        frame = store.trend(args.ontology, args.metric, args.last, args.level)
+    elif args.action == "tag":
+        store.tag(args.run, args.label)
+        frame = store.runs(1)
+    else:
+        frame = store.diff(args.since, args.until, args.level)
+        print(f"Run {frame.attrs['old_run']} -> run {frame.attrs['new_run']}: {len(frame)} changed {args.level} metrics")
+    store.close()
+    if args.csv:
+        frame.to_csv(sys.stdout, sep=";", index=False)
+    else:
+        print(frame.to_string(index=False))
+    return 0
+
+def overlap(args):
+    from Assets.Overlap import OverlapAnalysis
+    OverlapAnalysis(args.classes_dir, args.method).run(args.threshold, args.measure).save(args.out_dir)
+    return 0
+
+def queue(args):
+    from Assets.WorkQueue import WorkQueue, run_worker
+    if args.action == "create":
+        from Assets.Indicators import indicator_options
+        WorkQueue.create(args.queue, args.root, load_base_urls(args.base_urls), args.other_indicators, args.imports or args.network_imports,
+                         indicator_options(args.indicators), args.classes_out, args.lease, args.max_attempts, make_limits(args), args.network_imports).close()
+        return 0
+    if args.action == "work":
+        from Assets.Evaluation import run_tasks
+        tasks = [(args.queue, None if args.no_cache else args.cache_dir, args.streaming)] * max(args.jobs or 1, 1)
+        print(f"Completed {sum(run_tasks(run_worker, tasks, args.jobs))} works")
+        return 0
+    store = WorkQueue(args.queue)
+    try:
+        if args.action == "status":
+            status = store.status()
+            print(json.dumps(status))
+            return 1 if status["failed"] else 0
+        if args.action == "reset":
+            print(f"Reset {store.reset(args.failed)} works")
+            return 0
+        store.merge(args.work_out, args.file_out, args.reuse_out, args.partial)
+        return 0
+    finally:
+        store.close()
+
+def parser():
+    from Assets.Indicators import INDICATOR_GROUPS
+    main_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = main_parser.add_subparsers(dest="command")
+
+    def indicators(p):
+        p.add_argument("--indicators", nargs="+", choices=list(INDICATOR_GROUPS), metavar="GROUP",
+                       help=f"indicator groups to compute (default: all of {', '.join(INDICATOR_GROUPS)})")
+        p.add_argument("--other-indicators", action="store_true", help="also compute the other indicators")
+
+    def limits(p):
+        p.add_argument("--time-limit", type=float, metavar="SECONDS", help="evaluate each file and work in a child process killed after this long")
+        p.add_argument("--memory-limit", type=int, metavar="MB", help="address space of each child process")
+        p.add_argument("--retries", type=int, default=0, help="re-runs of a file or work that hit a limit, with higher limits")
+        p.add_argument("--limit-growth", type=float, default=2.0, help="factor applied to both limits at each retry")
+
+    p = commands.add_parser("evaluate", help="evaluate every work and file under the roots")
+    p.add_argument("roots", nargs="*", help="folders or zip/tar/rar archives of works (default: Ontologies, else Ontologies.rar)")
+    p.add_argument("--base-urls", default="baseURLperOntology.json", help="JSON map of work name to base URL")
+    indicators(p)
+    p.add_argument("--imports", action="store_true", help="resolve owl:imports of each work")
+    p.add_argument("--network-imports", action="store_true", help="like --imports, also fetching imports found in no local file from their IRI")
+    p.add_argument("--work-out", default="MetricsResults/Ontology Metrics Per Work.csv")
+    p.add_argument("--file-out", default="MetricsResults/Ontology Metrics Per File.csv")
+    p.add_argument("--reuse-out", help="with --full or several roots, also save the work x source reuse matrix here")
+    p.add_argument("--classes-out", default="OntologyClasses", help="directory of the per-work class lists")
+    p.add_argument("--jobs", type=int, default=os.cpu_count())
+    p.add_argument("--cache-dir", default=".cache/graphs")
+    p.add_argument("--no-cache", action="store_true", help="parse every file from scratch")
+    p.add_argument("--streaming", action="store_true", help="index files straight from the parser (bypasses the cache)")
+    p.add_argument("--full", action="store_true", help="re-evaluate everything instead of only what changed")
+    p.add_argument("--journal-dir", default="MetricsResults", help="where rows are journaled so interrupted runs resume")
+    p.add_argument("--no-arrow", dest="arrow", action="store_false", help="skip the Arrow copies of the result files")
+    p.add_argument("--history", default=HISTORY, help="SQLite history the run is recorded in ('' to disable)")
+    p.add_argument("--label", help="label of this run in the history, e.g. a release tag")
+    p.add_argument("--profile", action="store_true", help="add Wall Time, CPU Time, Triples and Peak RSS (MB) columns to every row")
+    p.add_argument("--profile-trace", metavar="PATH", help="also append every stage of every row to this JSONL file (implies --profile)")
+    p.add_argument("--cprofile", nargs="+", default=(), metavar="SOURCE", help="work names or file paths relative to the root to run under cProfile")
+    p.add_argument("--cprofile-dir", default="MetricsResults/profiles", help="where the .prof files of --cprofile are written")
+    limits(p)
+    p.set_defaults(func=evaluate)
+
+    p = commands.add_parser("check", help="print the metrics of single files as JSON lines")
+    p.add_argument("files", nargs="+")
+    indicators(p)
+    p.set_defaults(func=check)
+
+    p = commands.add_parser("history", help="query the metrics recorded by past runs")
+    p.add_argument("--history", default=HISTORY)
+    p.add_argument("--csv", action="store_true", help="print semicolon-separated values instead of a table")
+    actions = p.add_subparsers(dest="action", required=True)
+    q = actions.add_parser("runs", help="list the recorded runs")
+    q.add_argument("--last", type=int)
+    q = actions.add_parser("trend", help="one metric of one work (or file) over the last runs")
+    q.add_argument("ontology")
+    q.add_argument("metric")
+    q.add_argument("--last", type=int, default=50)
+    q.add_argument("--level", choices=["work", "file"], default="work")
+    q = actions.add_parser("diff", help="metrics that changed between two runs")
+    q.add_argument("--since", help="run id or label to compare from (default: the last labeled run)")
+    q.add_argument("--until", help="run id or label to compare to (default: the latest run)")
+    q.add_argument("--level", choices=["work", "file"], default="work")
+    q = actions.add_parser("tag", help="label a run, e.g. with a release tag")
+    q.add_argument("run")
+    q.add_argument("label")
+    p.set_defaults(func=history)
+
+    p = commands.add_parser("overlap", help="shared classes/properties between every pair of evaluated works")
+    p.add_argument("--classes-dir", default="OntologyClasses", help="directory of the *_classes.txt/*_properties.txt exports")
+    p.add_argument("--out-dir", default="MetricsResults")
+    p.add_argument("--method", choices=["auto", "exact", "minhash"], default="auto")
+    p.add_argument("--threshold", type=float, default=0.5, help="similarity linking two works into one cluster")
+    p.add_argument("--measure", choices=["containment", "jaccard"], default="containment", help="similarity used for clustering")
+    p.set_defaults(func=overlap)
+
+    p = commands.add_parser("queue", help="evaluate one corpus with workers on several nodes through a shared queue")
+    actions = p.add_subparsers(dest="action", required=True)
+    q = actions.add_parser("create", help="queue every work of root")
+    q.add_argument("queue", help="SQLite queue file on a filesystem shared by the workers")
+    q.add_argument("root", nargs="?", default="Ontologies", help="folder or archive of works, at the same path on every node")
+    q.add_argument("--base-urls", default="baseURLperOntology.json", help="JSON map of work name to base URL")
+    indicators(q)
+    q.add_argument("--imports", action="store_true", help="resolve owl:imports of each work")
+    q.add_argument("--network-imports", action="store_true", help="like --imports, also fetching imports found in no local file from their IRI")
+    q.add_argument("--classes-out", default="OntologyClasses", help="directory of the per-work class lists, shared by the workers")
+    q.add_argument("--lease", type=float, default=600, help="seconds before the work of a silent worker is handed to another")
+    q.add_argument("--max-attempts", type=int, default=3, help="claims of a work before it is failed")
+    limits(q)
+    q = actions.add_parser("work", help="claim and evaluate works until the queue is empty")
+    q.add_argument("queue")
+    q.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes on this node")
+    q.add_argument("--cache-dir", default=".cache/graphs")
+    q.add_argument("--no-cache", action="store_true", help="parse every file from scratch")
+    q.add_argument("--streaming", action="store_true", help="index files straight from the parser (bypasses the cache)")
+    q = actions.add_parser("status", help="print the item counts per state as JSON")
+    q.add_argument("queue")
+    q = actions.add_parser("merge", help="write the result files of a finished queue")
+    q.add_argument("queue")
+    q.add_argument("--work-out", default="MetricsResults/Ontology Metrics Per Work.csv")
+    q.add_argument("--file-out", default="MetricsResults/Ontology Metrics Per File.csv")
+    q.add_argument("--reuse-out", help="also save the work x source reuse matrix here")
+    q.add_argument("--partial", action="store_true", help="merge even if works are still pending (they get Error rows)")
+    q = actions.add_parser("reset", help="make the works pending again, to re-run the queue")
+    q.add_argument("queue")
+    q.add_argument("--failed", action="store_true", help="only the failed works")
+    p.set_defaults(func=queue)
+
+    commands.add_parser("serve", help="run the evaluation service (see main.py serve --help)")
+    return main_parser
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["serve"]:
+        from Assets.Service import main as serve
+        return serve(argv[1:]) or 0
+    if not argv or argv[0] not in COMMANDS and argv[0] not in ("-h", "--help"):
+        argv = ["evaluate"] + argv
+    args = parser().parse_args(argv)
+    return args.func(args) or 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import json, os, tempfile, threading, unittest
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import Request, urlopen
+from Assets.Service import EvaluationService, IndexPool, make_server
+
+PREFIXES = """@prefix ex: <http://example.org/onto#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+"""
+# Each module lacks some of the keys the indicators look up, so reads of absent keys are exercised
+MODULES = {
+    "core.ttl": PREFIXES + """
+ex:Sensor a owl:Class ; rdfs:label "Sensor" .
+ex:Device a owl:Class ; rdfs:comment "A device" .
+ex:Sensor rdfs:subClassOf ex:Device .
+ex:observes a owl:ObjectProperty ; rdfs:domain ex:Sensor ; rdfs:range ex:Device .
+""",
+    "data.ttl": PREFIXES + """
+ex:value a owl:DatatypeProperty , owl:FunctionalProperty .
+ex:s1 a ex:Sensor .
+""",
+    "empty.ttl": PREFIXES,
+}
+
+class ConcurrentEvaluateTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.work = os.path.join(self.tmp.name, "Work")
+        os.mkdir(self.work)
+        for name, text in MODULES.items():
+            with open(os.path.join(self.work, name), "w", encoding="utf-8") as f:
+                f.write(text)
+        self.service = EvaluationService({}, IndexPool())
+        self.server = make_server(self.service, port=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def post(self, body):
+        url = f"http://127.0.0.1:{self.server.server_port}/evaluate"
+        request = Request(url, json.dumps(body).encode("utf-8"), {"Content-Type": "application/json"})
+        with urlopen(request, timeout=60) as response:
+            return response.status, json.load(response)["results"]
+
+    def test_concurrent_requests_share_pooled_indexes(self):
+        files = [os.path.join(self.work, name) for name in MODULES]
+        requests = [{"paths": [path], "add_other_indicators": True} for path in files]
+        requests += [{"paths": [self.work], "mode": "work", "add_other_indicators": other} for other in (False, True)]
+        sequential = EvaluationService({}, IndexPool())
+        expected = [sequential.evaluate(body["paths"], body.get("mode", "file"), body["add_other_indicators"]) for body in requests]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(self.post, requests * 10))
+
+        for i, (status, rows) in enumerate(responses):
+            self.assertEqual(status, 200)
+            self.assertEqual(rows, json.loads(json.dumps(expected[i % len(requests)])))
+        # Reads must not have inserted keys into the pooled indexes, which would also outgrow their recorded size
+        for path in files:
+            index = self.service.pool.get(path).index
+            for name in ("typed", "ground", "subjects_with", "superclasses"):
+                self.assertTrue(all(getattr(index, name).values()), f"{path}: empty {name} entry")
+
+if __name__ == "__main__":
+    unittest.main()